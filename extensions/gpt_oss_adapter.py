@@ -13,9 +13,10 @@ IMPORTANT: Only applies to GPT-OSS models to avoid breaking other models.
 """
 
 import re
-import json
 from typing import Generator, List, Optional
 
+from extensions import fast_json
+
 # Compiled regex patterns (lazy init)
 _GPT_OSS_PATTERNS = None
 
@@ -156,6 +157,22 @@ def _fix_tool_calls_in_conversation(request):
                     break
 
 
+def _build_tool_calls(parsed_tools) -> list:
+    """Convert parsed Harmony tool calls to OpenAI ToolCall objects."""
+    from mlx_omni_server.chat.openai.schema import ToolCall, FunctionCall, ToolType
+
+    dumps = fast_json.dumps
+    function_type = ToolType.FUNCTION
+    return [
+        ToolCall(
+            id=tc.id,
+            type=function_type,
+            function=FunctionCall(name=tc.name, arguments=dumps(tc.arguments))
+        )
+        for tc in parsed_tools
+    ]
+
+
 def patch_openai_adapter():
     """
     Patch OpenAI adapter to extract 'final' channel from GPT-OSS format responses.
@@ -164,6 +181,10 @@ def patch_openai_adapter():
     """
     from mlx_omni_server.chat.openai.openai_adapter import OpenAIAdapter
 
+    # Wrap only once, even if called again
+    if getattr(OpenAIAdapter, "_mlx_studio_gpt_oss_patched", False):
+        return
+
     # Patch non-streaming generate
     original_generate = OpenAIAdapter.generate
 
@@ -197,18 +218,7 @@ def patch_openai_adapter():
                 if has_harmony_tool_calls(full_text):
                     parsed_tools = parse_harmony_tool_calls(full_text)
                     if parsed_tools:
-                        from mlx_omni_server.chat.openai.schema import ToolCall, FunctionCall, ToolType
-                        tool_calls = [
-                            ToolCall(
-                                id=tc.id,
-                                type=ToolType.FUNCTION,
-                                function=FunctionCall(
-                                    name=tc.name,
-                                    arguments=json.dumps(tc.arguments)
-                                )
-                            )
-                            for tc in parsed_tools
-                        ]
+                        tool_calls = _build_tool_calls(parsed_tools)
                         response.choices[0].message.tool_calls = tool_calls
                         response.choices[0].message.content = ""  # Clear content when tool_calls present
                         response.choices[0].finish_reason = "tool_calls"
@@ -241,7 +251,7 @@ def patch_openai_adapter():
 
         # Track accumulated text for channel format extraction
         # GPT-OSS needs full content buffered to extract the 'final' channel
-        accumulated_text = ""
+        text_parts = []  # Joined once after the stream (string += is O(n²))
         buffered_chunks = []
         first_chunk = None
 
@@ -251,14 +261,16 @@ def patch_openai_adapter():
                 first_chunk = chunk
 
             # Extract content from chunk
-            if chunk.choices:
-                delta = chunk.choices[0].delta
-                if delta and delta.content:
-                    accumulated_text += delta.content
+            choices = chunk.choices
+            delta = choices[0].delta if choices else None
+            if delta is not None and delta.content:
+                text_parts.append(delta.content)
 
             # Buffer all chunks for GPT-OSS models (need full content for channel extraction)
             buffered_chunks.append(chunk)
 
+        accumulated_text = ''.join(text_parts)
+
         # Process GPT-OSS format at end of stream
         if accumulated_text and first_chunk:
             final_content = extract_final_channel(accumulated_text)
@@ -274,18 +286,7 @@ def patch_openai_adapter():
             if has_harmony_tool_calls(accumulated_text):
                 parsed_tools = parse_harmony_tool_calls(accumulated_text)
                 if parsed_tools:
-                    from mlx_omni_server.chat.openai.schema import ToolCall, FunctionCall, ToolType
-                    tool_calls = [
-                        ToolCall(
-                            id=tc.id,
-                            type=ToolType.FUNCTION,
-                            function=FunctionCall(
-                                name=tc.name,
-                                arguments=json.dumps(tc.arguments)
-                            )
-                        )
-                        for tc in parsed_tools
-                    ]
+                    tool_calls = _build_tool_calls(parsed_tools)
                     finish_reason = "tool_calls"
                     final_content = ""  # Clear content when tool_calls present
                     print(f"[gpt-oss] Parsed {len(tool_calls)} tool call(s) from stream")
@@ -316,7 +317,7 @@ def patch_openai_adapter():
                         finish_reason=finish_reason,
                     )
                 ],
-                usage=last_chunk.usage if hasattr(last_chunk, 'usage') else None,
+                usage=last_chunk.usage if last_chunk is not None else None,
             )
         elif buffered_chunks:
             # No content accumulated (empty response) - flush as-is
@@ -324,4 +325,6 @@ def patch_openai_adapter():
                 yield buffered
 
     OpenAIAdapter.generate_stream = patched_generate_stream
+    # Flag only once both wrappers are in place, so a failed install is retried
+    OpenAIAdapter._mlx_studio_gpt_oss_patched = True
     print("[gpt-oss] Channel format adapter installed")
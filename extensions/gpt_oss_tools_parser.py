@@ -14,12 +14,12 @@ them to OpenAI-compatible tool_calls structure.
 
 import re
 import json
-import uuid
+from os import urandom
 from dataclasses import dataclass
 from typing import List, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParsedToolCall:
     """Represents a parsed tool call."""
     id: str
@@ -96,7 +96,7 @@ def parse_harmony_tool_calls(text: str) -> List[ParsedToolCall]:
                         continue
 
                 tool_calls.append(ParsedToolCall(
-                    id=f"call_{uuid.uuid4().hex[:8]}",
+                    id=f"call_{urandom(4).hex()}",
                     name=func_name,
                     arguments=arguments
                 ))
@@ -3,8 +3,13 @@ Multi-slot KV Cache Manager with disk persistence.
 
 Unique feature of MLX Studio - allows caching multiple conversations
 simultaneously with LRU eviction and optional persistence to disk.
+
+mlx-lm prompt caches are persisted as safetensors and loaded lazily by
+mx.load, so slots restored from disk hold file-backed arrays instead of a
+second unpickled copy. Other cache objects fall back to pickle.
 """
 
+import os
 import time
 import threading
 import logging
@@ -13,8 +18,11 @@ import json
 import pickle
 from pathlib import Path
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List
 
+from . import fast_json
+
 # Default cache directory
 DEFAULT_CACHE_DIR = Path.home() / ".mlx-studio" / "cache" / "kv"
 
@@ -43,6 +51,10 @@ class KVCacheManager:
         """Get file path for a cached KV state."""
         return self.cache_dir / f"{cache_key}.cache"
 
+    def _get_tensor_path(self, cache_key: str) -> Path:
+        """Get file path for a cached KV state saved as safetensors."""
+        return self.cache_dir / f"{cache_key}.safetensors"
+
     def _get_meta_path(self, cache_key: str) -> Path:
         """Get file path for cache metadata."""
         return self.cache_dir / f"{cache_key}.meta"
@@ -52,8 +64,7 @@ class KVCacheManager:
         index_path = self.cache_dir / "index.json"
         if index_path.exists():
             try:
-                with open(index_path) as f:
-                    self.persisted_keys = set(json.load(f))
+                self.persisted_keys = set(fast_json.loads(index_path.read_bytes()))
                 self.logger.info(f"Loaded {len(self.persisted_keys)} persisted cache entries")
             except Exception as e:
                 self.logger.warning(f"Failed to load cache index: {e}")
@@ -62,20 +73,31 @@ class KVCacheManager:
             self.persisted_keys = set()
 
     def _save_index(self):
-        """Save cache index to disk."""
+        """Save cache index to disk.
+
+        Writes to a temp file and renames it over index.json, so a crash mid-write
+        cannot leave a truncated index (which would drop every persisted entry).
+        """
         index_path = self.cache_dir / "index.json"
+        tmp_path = index_path.with_suffix(".json.tmp")
         try:
-            with open(index_path, 'w') as f:
-                json.dump(list(self.persisted_keys), f)
+            tmp_path.write_bytes(fast_json.dumps_bytes(list(self.persisted_keys)))
+            tmp_path.replace(index_path)
         except Exception as e:
             self.logger.warning(f"Failed to save cache index: {e}")
 
     def _compute_cache_key(self, messages: List[Dict], model_id: str) -> str:
         """Compute a unique key for a conversation state."""
-        content = f"{model_id}:" + "|".join(
-            f"{m['role']}:{m['content']}" for m in messages[:-1]
-        )
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+        # Keys name persisted cache files, so the format (truncated SHA-256) must
+        # stay stable. Messages are fed one at a time so the joined prefix is
+        # never built and encoded as one big string; the digest is the same as
+        # hashing the join.
+        h = hashlib.sha256(f"{model_id}:".encode())
+        for i, m in enumerate(messages[:-1]):
+            if i:
+                h.update(b"|")
+            h.update(f"{m['role']}:{m['content']}".encode())
+        return h.hexdigest()[:16]
 
     def get_cache(self, messages: List[Dict], model_id: str) -> Optional[Any]:
         """Get cached KV state for a conversation prefix."""
@@ -108,23 +130,30 @@ class KVCacheManager:
     def _load_from_disk(self, cache_key: str, model_id: str) -> Optional[Any]:
         """Load KV cache from disk."""
         meta_path = self._get_meta_path(cache_key)
+        tensor_path = self._get_tensor_path(cache_key)
         cache_path = self._get_cache_path(cache_key)
 
-        if not meta_path.exists() or not cache_path.exists():
+        if not meta_path.exists():
+            return None
+        has_tensors = tensor_path.exists()
+        if not has_tensors and not cache_path.exists():
             return None
 
         try:
-            with open(meta_path) as f:
-                meta = json.load(f)
+            meta = fast_json.loads(meta_path.read_bytes())
 
             # Verify model compatibility
             if meta.get('model_id') != model_id:
                 self.logger.warning(f"Cache model mismatch: {meta.get('model_id')} vs {model_id}")
                 return None
 
-            # Load actual cache data
-            with open(cache_path, 'rb') as f:
-                cache_data = pickle.load(f)
+            # Load actual cache data (safetensors are mapped lazily, not copied)
+            if has_tensors:
+                from mlx_lm.models.cache import load_prompt_cache
+                cache_data = load_prompt_cache(str(tensor_path))
+            else:
+                with open(cache_path, 'rb') as f:
+                    cache_data = pickle.load(f)
 
             # Store in memory for faster access
             self.slots[cache_key] = {
@@ -139,6 +168,22 @@ class KVCacheManager:
             self.logger.warning(f"Failed to load cache from disk: {e}")
             return None
 
+    def _save_tensors(self, cache_key: str, cache: Any) -> bool:
+        """Save an mlx-lm prompt cache as safetensors.
+
+        Returns False if the cache is not an mlx-lm prompt cache, in which
+        case the caller falls back to pickle.
+        """
+        if not isinstance(cache, list) or not cache or not hasattr(cache[0], 'state'):
+            return False
+        try:
+            from mlx_lm.models.cache import save_prompt_cache
+        except ImportError:
+            return False
+
+        save_prompt_cache(str(self._get_tensor_path(cache_key)), cache)
+        return True
+
     def store_cache(self, messages: List[Dict], model_id: str, cache: Any, token_count: int, persist: bool = False):
         """Store KV cache for a conversation state."""
         cache_key = self._compute_cache_key(messages, model_id)
@@ -181,12 +226,13 @@ class KVCacheManager:
                     for m in messages[:3]
                 ]
             }
-            with open(meta_path, 'w') as f:
-                json.dump(meta, f, indent=2)
+            # Compact, single write: metadata is only ever read back by this class
+            meta_path.write_bytes(fast_json.dumps_bytes(meta))
 
             # Save cache data
-            with open(cache_path, 'wb') as f:
-                pickle.dump(cache, f)
+            if not self._save_tensors(cache_key, cache):
+                with open(cache_path, 'wb') as f:
+                    pickle.dump(cache, f)
 
             self.persisted_keys.add(cache_key)
             self._save_index()
@@ -216,30 +262,41 @@ class KVCacheManager:
             )
             return True
 
+    def _read_meta(self, meta_path: str) -> Optional[Dict[str, Any]]:
+        """Read a single metadata file, returning None if unreadable."""
+        try:
+            with open(meta_path, 'rb') as f:
+                return fast_json.loads(f.read())
+        except Exception:
+            return None
+
     def list_persisted(self) -> List[Dict[str, Any]]:
         """List all persisted cache entries."""
-        entries = []
-        for cache_key in self.persisted_keys:
-            meta_path = self._get_meta_path(cache_key)
-            if meta_path.exists():
-                try:
-                    with open(meta_path) as f:
-                        meta = json.load(f)
-                    entries.append(meta)
-                except:
-                    pass
-        return entries
+        try:
+            with os.scandir(self.cache_dir) as it:
+                meta_paths = [
+                    entry.path for entry in it
+                    if entry.name.endswith('.meta') and entry.name[:-5] in self.persisted_keys
+                ]
+        except FileNotFoundError:
+            return []
+
+        if not meta_paths:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(8, len(meta_paths))) as executor:
+            return [meta for meta in executor.map(self._read_meta, meta_paths) if meta is not None]
 
     def delete_persisted(self, cache_key: str) -> bool:
         """Delete a persisted cache entry."""
         try:
-            meta_path = self._get_meta_path(cache_key)
-            cache_path = self._get_cache_path(cache_key)
-
-            if meta_path.exists():
-                meta_path.unlink()
-            if cache_path.exists():
-                cache_path.unlink()
+            for path in (
+                self._get_meta_path(cache_key),
+                self._get_tensor_path(cache_key),
+                self._get_cache_path(cache_key),
+            ):
+                if path.exists():
+                    path.unlink()
 
             self.persisted_keys.discard(cache_key)
             self._save_index()
@@ -15,7 +15,7 @@ Performance: Uses stream-first approach with lookback buffer to handle
 markers that span chunk boundaries.
 """
 
-import json
+import re
 from collections import deque
 
 # Import schema classes at module level (not in hot path)
@@ -29,6 +29,7 @@ from mlx_omni_server.chat.openai.schema import (
     Role,
 )
 
+from extensions import fast_json
 from extensions.mistral_tools_parser import (
     parse_mistral_tool_calls,
     has_mistral_tool_calls,
@@ -38,17 +39,33 @@ from extensions.mistral_tools_parser import (
 TOOL_MARKER_START = '[TOOL_CALLS]'
 TOOL_MARKER_PARTIAL = '[TOOL_CALLS'  # For early detection
 
+# Characters carried between chunks so a marker split across them is still found
+MARKER_TAIL_SIZE = len(TOOL_MARKER_PARTIAL) - 1
+
+
+# Model ID patterns: devstral, mistral, ministral (case-insensitive)
+MISTRAL_MODEL_PATTERN = re.compile(r'devstral|m(?:in)?istral', re.IGNORECASE)
+
 
 def is_mistral_model(model_id: str) -> bool:
     """Check if a model is a Mistral/Devstral model that needs tool call parsing."""
     if not model_id:
         return False
-    model_lower = model_id.lower()
-    return any(x in model_lower for x in [
-        'devstral',
-        'mistral',
-        'ministral',
-    ])
+    return MISTRAL_MODEL_PATTERN.search(model_id) is not None
+
+
+def _build_tool_calls(parsed_tools) -> list:
+    """Convert parsed Mistral tool calls to OpenAI ToolCall objects."""
+    dumps = fast_json.dumps
+    function_type = ToolType.FUNCTION
+    return [
+        ToolCall(
+            id=tc.id,
+            type=function_type,
+            function=FunctionCall(name=tc.name, arguments=dumps(tc.arguments))
+        )
+        for tc in parsed_tools
+    ]
 
 
 def patch_openai_adapter():
@@ -59,6 +76,10 @@ def patch_openai_adapter():
     """
     from mlx_omni_server.chat.openai.openai_adapter import OpenAIAdapter
 
+    # Wrap only once, even if called again
+    if getattr(OpenAIAdapter, "_mlx_studio_mistral_patched", False):
+        return
+
     # Store original methods
     original_generate = OpenAIAdapter.generate
     original_generate_stream = OpenAIAdapter.generate_stream
@@ -80,17 +101,7 @@ def patch_openai_adapter():
                 parsed_tools = parse_mistral_tool_calls(content)
 
                 if parsed_tools:
-                    tool_calls = [
-                        ToolCall(
-                            id=tc.id,
-                            type=ToolType.FUNCTION,
-                            function=FunctionCall(
-                                name=tc.name,
-                                arguments=json.dumps(tc.arguments)
-                            )
-                        )
-                        for tc in parsed_tools
-                    ]
+                    tool_calls = _build_tool_calls(parsed_tools)
 
                     # Skip content before tool calls - match llama.cpp behavior
                     response.choices[0].message.tool_calls = tool_calls
@@ -116,51 +127,61 @@ def patch_openai_adapter():
         # NOTE: We parse tool calls regardless of request.tools
         # The model outputs [TOOL_CALLS] format based on training, not request params
 
-        # Lookback buffer - hold N chunks before yielding to catch split markers
+        # Lookback buffer - chunks held back (not yet yielded) to catch split markers
         LOOKBACK_SIZE = 3
-        lookback_buffer = deque(maxlen=LOOKBACK_SIZE)
+        lookback_buffer = deque()
 
-        text_parts = []  # Use list for O(n) instead of string concat O(n²)
-        all_chunks = []  # Keep all chunks in case we need them
+        text_parts = []  # Text from the tool marker onward, filled only once detected
+        post_marker_chunks = []  # Chunks from the marker onward, for the parse-failure fallback
         first_chunk = None
         last_chunk = None
         tool_marker_detected = False
 
-        # Accumulated text for marker detection
-        accumulated_text = ""
+        # Tail of the streamed text for marker detection (bounded, not the full text)
+        tail = ""
 
-        for chunk in original_generate_stream(self, request):
+        stream = iter(original_generate_stream(self, request))
+
+        # Phase 1: stream chunks through the lookback buffer until a marker shows up
+        for chunk in stream:
             if first_chunk is None:
                 first_chunk = chunk
             last_chunk = chunk
-            all_chunks.append(chunk)
 
             # Extract content from chunk
-            content = None
-            if chunk.choices and chunk.choices[0].delta:
-                content = chunk.choices[0].delta.content
+            choices = chunk.choices
+            delta = choices[0].delta if choices else None
+            content = delta.content if delta is not None else None
 
             if content:
-                text_parts.append(content)
-                accumulated_text += content
-
-            # Check for tool marker (check partial to catch early)
-            if not tool_marker_detected:
-                if TOOL_MARKER_PARTIAL in accumulated_text:
+                # Check for tool marker (check partial to catch early)
+                window = tail + content
+                marker_pos = window.find(TOOL_MARKER_PARTIAL)
+                if marker_pos != -1:
                     tool_marker_detected = True
+                    # Start collecting text at the marker - nothing before it is parsed
+                    text_parts.append(window[marker_pos:])
                     # Don't yield anything from here - buffer the rest
-                    continue
-
-            if tool_marker_detected:
-                # Already in buffer mode, just continue collecting
-                continue
+                    post_marker_chunks.append(chunk)
+                    break
+                tail = window[-MARKER_TAIL_SIZE:]
 
             # Add to lookback buffer
             lookback_buffer.append(chunk)
 
             # Only yield when buffer is full (delayed streaming)
             if len(lookback_buffer) == LOOKBACK_SIZE:
-                yield lookback_buffer[0]
+                yield lookback_buffer.popleft()
+
+        # Phase 2: marker seen - collect the rest of the stream for parsing
+        if tool_marker_detected:
+            for chunk in stream:
+                last_chunk = chunk
+                choices = chunk.choices
+                delta = choices[0].delta if choices else None
+                if delta is not None and delta.content:
+                    text_parts.append(delta.content)
+                post_marker_chunks.append(chunk)
 
         # After generation completes
         if tool_marker_detected:
@@ -172,18 +193,9 @@ def patch_openai_adapter():
 
                 if parsed_tools:
                     # Build tool_calls with index for streaming format
-                    tool_calls = []
-                    for idx, tc in enumerate(parsed_tools):
-                        tool_call = ToolCall(
-                            id=tc.id,
-                            type=ToolType.FUNCTION,
-                            function=FunctionCall(
-                                name=tc.name,
-                                arguments=json.dumps(tc.arguments)
-                            )
-                        )
+                    tool_calls = _build_tool_calls(parsed_tools)
+                    for idx, tool_call in enumerate(tool_calls):
                         tool_call.index = idx
-                        tool_calls.append(tool_call)
 
                     # Yield single chunk with all tool calls
                     yield ChatCompletionChunk(
@@ -201,13 +213,13 @@ def patch_openai_adapter():
                                 finish_reason="tool_calls",
                             )
                         ],
-                        usage=last_chunk.usage if last_chunk and hasattr(last_chunk, 'usage') else None,
+                        usage=last_chunk.usage if last_chunk is not None else None,
                     )
                     return
 
-            # Tool marker detected but parsing failed - yield all chunks
-            for chunk in all_chunks:
-                yield chunk
+            # Tool marker detected but parsing failed - yield everything held back
+            yield from lookback_buffer
+            yield from post_marker_chunks
         else:
             # No tool marker - yield remaining chunks in lookback buffer
             for chunk in lookback_buffer:
@@ -215,3 +227,5 @@ def patch_openai_adapter():
 
     OpenAIAdapter.generate = patched_generate
     OpenAIAdapter.generate_stream = patched_generate_stream
+    # Flag only once both wrappers are in place, so a failed install is retried
+    OpenAIAdapter._mlx_studio_mistral_patched = True
@@ -10,12 +10,12 @@ them to OpenAI-compatible tool_calls structure.
 
 import re
 import json
-import uuid
+from os import urandom
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParsedToolCall:
     """Represents a parsed tool call."""
     id: str
@@ -23,18 +23,89 @@ class ParsedToolCall:
     arguments: dict
 
 
-# Regex pattern for Mistral/Devstral tool calls
 # Format: [TOOL_CALLS]function_name[ARGS]{json_arguments}
-MISTRAL_TOOL_PATTERN = re.compile(
-    r'\[TOOL_CALLS\](\w+)\[ARGS\](\{[^}]*\}|\{.*?\})',
-    re.DOTALL
-)
+TOOL_CALLS_MARKER = '[TOOL_CALLS]'
+ARGS_MARKER = '[ARGS]'
 
-# Alternative pattern for multi-line JSON
-MISTRAL_TOOL_PATTERN_MULTILINE = re.compile(
-    r'\[TOOL_CALLS\](\w+)\[ARGS\](.*?)(?=\[TOOL_CALLS\]|$)',
-    re.DOTALL
-)
+# Characters that matter when finding the end of a JSON object
+_JSON_STRUCTURE_CHARS = re.compile(r'[{}"\\]')
+
+# Match "key": "value" or "key": value patterns (malformed JSON recovery)
+_KV_PATTERN = re.compile(r'"(\w+)"\s*:\s*(?:"([^"]*)"|([\w./\-]+)|\[([^\]]*)\])')
+
+# Unquoted literals and number punctuation for malformed JSON value coercion
+_JSON_LITERALS = {'true': True, 'false': False, 'null': None}
+_NUMBER_PUNCTUATION = str.maketrans('', '', '.-')
+
+
+def _find_object_end(text: str, pos: int) -> int:
+    """
+    Find the end of the JSON object starting at pos (after optional whitespace).
+
+    Braces inside string literals are ignored. Returns the index just past
+    the closing brace, or -1 if there is no object or it is never closed.
+    """
+    n = len(text)
+    while pos < n and text[pos].isspace():
+        pos += 1
+    if pos >= n or text[pos] != '{':
+        return -1
+
+    depth = 0
+    in_string = False
+    escaped_pos = -1
+    for match in _JSON_STRUCTURE_CHARS.finditer(text, pos):
+        i = match.start()
+        if i == escaped_pos:
+            continue
+        char = text[i]
+        if char == '\\':
+            if in_string:
+                escaped_pos = i + 1
+        elif char == '"':
+            in_string = not in_string
+        elif in_string:
+            continue
+        elif char == '{':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return i + 1
+    return -1
+
+
+def _scan_tool_calls(text: str) -> List[Tuple[str, str]]:
+    """
+    Extract (function_name, args_str) pairs in a single forward pass.
+
+    Arguments are the brace-balanced JSON object after [ARGS]. If it is never
+    closed (e.g. truncated output), everything up to the next [TOOL_CALLS] or
+    the end of text is returned and left to _parse_json_args to repair.
+    """
+    calls = []
+    n = len(text)
+    start = text.find(TOOL_CALLS_MARKER)
+    while start != -1:
+        name_start = start + len(TOOL_CALLS_MARKER)
+        name_end = name_start
+        while name_end < n and (text[name_end].isalnum() or text[name_end] == '_'):
+            name_end += 1
+
+        if name_end == name_start or not text.startswith(ARGS_MARKER, name_end):
+            start = text.find(TOOL_CALLS_MARKER, name_start)
+            continue
+
+        args_start = name_end + len(ARGS_MARKER)
+        args_end = _find_object_end(text, args_start)
+        if args_end == -1:
+            next_marker = text.find(TOOL_CALLS_MARKER, args_start)
+            args_end = n if next_marker == -1 else next_marker
+
+        calls.append((text[name_start:name_end], text[args_start:args_end]))
+        start = text.find(TOOL_CALLS_MARKER, args_end)
+
+    return calls
 
 
 def parse_mistral_tool_calls(text: str) -> List[ParsedToolCall]:
@@ -51,40 +122,31 @@ def parse_mistral_tool_calls(text: str) -> List[ParsedToolCall]:
         return []
 
     # Quick check - must have tool call marker
-    if '[TOOL_CALLS]' not in text:
+    if TOOL_CALLS_MARKER not in text:
         return []
 
     tool_calls = []
     seen_calls = set()  # Deduplicate
 
-    # Try simple pattern first
-    matches = MISTRAL_TOOL_PATTERN.findall(text)
+    for func_name, args_str in _scan_tool_calls(text):
+        args_str = args_str.strip()
 
-    # If no matches, try multiline pattern
-    if not matches:
-        matches = MISTRAL_TOOL_PATTERN_MULTILINE.findall(text)
+        # Skip if we've seen this exact call
+        call_key = f"{func_name}:{args_str}"
+        if call_key in seen_calls:
+            continue
+        seen_calls.add(call_key)
 
-    for match in matches:
-        if len(match) >= 2:
-            func_name = match[0].strip()
-            args_str = match[1].strip()
-
-            # Skip if we've seen this exact call
-            call_key = f"{func_name}:{args_str}"
-            if call_key in seen_calls:
-                continue
-            seen_calls.add(call_key)
-
-            # Parse arguments JSON
-            arguments = _parse_json_args(args_str)
-            if arguments is None:
-                continue
-
-            tool_calls.append(ParsedToolCall(
-                id=f"call_{uuid.uuid4().hex[:8]}",
-                name=func_name,
-                arguments=arguments
-            ))
+        # Parse arguments JSON
+        arguments = _parse_json_args(args_str)
+        if arguments is None:
+            continue
+
+        tool_calls.append(ParsedToolCall(
+            id=f"call_{urandom(4).hex()}",
+            name=func_name,
+            arguments=arguments
+        ))
 
     return tool_calls
 
@@ -102,6 +164,17 @@ def _parse_json_args(args_str: str) -> Optional[dict]:
     if not args_str:
         return {}
 
+    # Fast path: Devstral almost always emits a valid JSON object. Anything
+    # else (arrays, strings, null) goes through the cleanup below like before.
+    # Stdlib json on purpose: orjson turns integers past 64 bits (IDs) into floats.
+    try:
+        arguments = json.loads(args_str)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(arguments, dict):
+            return arguments
+
     # Clean up the string
     args_str = args_str.strip()
 
@@ -140,9 +213,7 @@ def _parse_malformed_json(text: str) -> Optional[dict]:
     """
     result = {}
 
-    # Match "key": "value" or "key": value patterns
-    kv_pattern = re.compile(r'"(\w+)"\s*:\s*(?:"([^"]*)"|([\w./\-]+)|\[([^\]]*)\])')
-    matches = kv_pattern.findall(text)
+    matches = _KV_PATTERN.findall(text)
 
     for match in matches:
         key = match[0]
@@ -152,11 +223,10 @@ def _parse_malformed_json(text: str) -> Optional[dict]:
         elif match[2]:  # Unquoted value
             value = match[2]
             # Try to convert to appropriate type
-            if value.lower() == 'true':
-                value = True
-            elif value.lower() == 'false':
-                value = False
-            elif value.replace('.', '').replace('-', '').isdigit():
+            literal = value.lower()
+            if literal in _JSON_LITERALS:
+                value = _JSON_LITERALS[literal]
+            elif value.translate(_NUMBER_PUNCTUATION).isdigit():
                 try:
                     value = int(value) if '.' not in value else float(value)
                 except ValueError:
@@ -186,7 +256,9 @@ def has_mistral_tool_calls(text: str) -> bool:
     """
     if not text:
         return False
-    return '[TOOL_CALLS]' in text and '[ARGS]' in text
+    # [ARGS] always follows [TOOL_CALLS], so search for it after the marker
+    start = text.find(TOOL_CALLS_MARKER)
+    return start != -1 and text.find(ARGS_MARKER, start + len(TOOL_CALLS_MARKER)) != -1
 
 
 def extract_content_before_tools(text: str) -> str:
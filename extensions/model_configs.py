@@ -5,10 +5,12 @@ Allows setting context_length, max_tokens, temperature, etc. per model.
 Works for both MLX and GGUF models, regardless of Claude tier routing.
 """
 
-import json
+import copy
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
+
+from . import fast_json
 
 logger = logging.getLogger("mlx-studio.model-configs")
 
@@ -30,24 +32,66 @@ GLOBAL_DEFAULTS = {
 }
 
 
+# Parsed CONFIG_FILE, reused until the file's mtime changes
+_cache: Dict[str, Any] = {"mtime": None, "data": None}
+
+# Resolved per-model configs, keyed by (model_id, CONFIG_FILE mtime)
+_resolved: Dict[Tuple[str, Optional[int]], dict] = {}
+
+
 def load_model_configs() -> dict:
-    """Load all model configurations from file."""
-    if CONFIG_FILE.exists():
-        try:
-            with open(CONFIG_FILE) as f:
-                return json.load(f)
-        except Exception as e:
-            logger.warning(f"Failed to load model configs: {e}")
-    return {"configs": {}, "defaults": GLOBAL_DEFAULTS}
-
-
-def save_model_configs(data: dict):
-    """Save model configurations to file."""
+    """Load all model configurations from file.
+
+    The parsed file is cached and only re-read when its mtime changes.
+    The dict is shared between callers - do not mutate it.
+    """
+    try:
+        mtime = CONFIG_FILE.stat().st_mtime_ns
+    except OSError:
+        _cache["mtime"] = None
+        return {"configs": {}, "defaults": GLOBAL_DEFAULTS}
+
+    if mtime == _cache["mtime"]:
+        return _cache["data"]
+
+    _resolved.clear()
+    try:
+        data = fast_json.loads(CONFIG_FILE.read_bytes())
+    except Exception as e:
+        logger.warning(f"Failed to load model configs: {e}")
+        _cache["mtime"] = None
+        return {"configs": {}, "defaults": GLOBAL_DEFAULTS}
+
+    _cache["mtime"] = mtime
+    _cache["data"] = data
+    return data
+
+
+def _editable_configs() -> dict:
+    """Deep copy of the loaded configs for a writer to change and save."""
+    return copy.deepcopy(load_model_configs())
+
+
+def save_model_configs(data: dict) -> bool:
+    """Save model configurations to file.
+
+    Writes to a temp file and renames it over CONFIG_FILE, so readers never
+    see a partially written file. The cache only switches to `data` once the
+    write succeeded; on failure it keeps matching the file on disk.
+    """
+    tmp_file = CONFIG_FILE.with_suffix(".json.tmp")
     try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(data, f, indent=2)
+        tmp_file.write_bytes(fast_json.dumps_bytes(data, indent=True))
+        tmp_file.replace(CONFIG_FILE)
+        mtime = CONFIG_FILE.stat().st_mtime_ns
     except Exception as e:
         logger.error(f"Failed to save model configs: {e}")
+        return False
+
+    _resolved.clear()
+    _cache["data"] = data
+    _cache["mtime"] = mtime
+    return True
 
 
 def get_model_config(model_id: str) -> dict:
@@ -58,9 +102,19 @@ def get_model_config(model_id: str) -> dict:
 
     Returns:
         Dict with context_length, max_tokens, temperature, top_p
-        Falls back to defaults if model has no specific config
+        Falls back to defaults if model has no specific config.
+        The dict is cached and shared between callers - do not mutate it.
     """
     data = load_model_configs()
+    key = (model_id, _cache["mtime"])
+    config = _resolved.get(key)
+    if config is None:
+        config = _resolved[key] = _resolve_model_config(model_id, data)
+    return config
+
+
+def _resolve_model_config(model_id: str, data: dict) -> dict:
+    """Merge a model's stored config with the defaults."""
     configs = data.get("configs", {})
     defaults = data.get("defaults", GLOBAL_DEFAULTS)
 
@@ -105,7 +159,7 @@ def set_model_config(model_id: str, **kwargs) -> dict:
     Returns:
         Updated config for the model
     """
-    data = load_model_configs()
+    data = _editable_configs()
     if "configs" not in data:
         data["configs"] = {}
 
@@ -133,7 +187,7 @@ def delete_model_config(model_id: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    data = load_model_configs()
+    data = _editable_configs()
     if model_id in data.get("configs", {}):
         del data["configs"][model_id]
         save_model_configs(data)
@@ -151,7 +205,7 @@ def set_defaults(**kwargs) -> dict:
     Returns:
         Updated defaults
     """
-    data = load_model_configs()
+    data = _editable_configs()
     if "defaults" not in data:
         data["defaults"] = dict(GLOBAL_DEFAULTS)
 
@@ -7,20 +7,50 @@ Provides:
 - Model metadata and size information
 """
 
+import asyncio
 import os
+import re
 import json
 import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+try:
+    from huggingface_hub import HfApi, snapshot_download
+except ImportError:
+    HfApi = snapshot_download = None
+
 # Model directories
 HF_CACHE_DIR = Path(os.environ.get("HF_HOME", Path.home() / ".cache" / "huggingface")) / "hub"
 LMSTUDIO_MODELS_DIR = Path.home() / ".lmstudio" / "models"
 
+# Download statuses kept for get_download_status; oldest finished ones are dropped
+MAX_TRACKED_DOWNLOADS = 256
+
+# HuggingFace search/model info results are reused for this many seconds
+HF_CACHE_TTL = 60
+HF_CACHE_MAX_ENTRIES = 256
+
+# Model folders are stamped/scanned in parallel when there are more than this many
+SCAN_PARALLEL_THRESHOLD = 4
+SCAN_MAX_WORKERS = 16
+
+
+def _map_io(fn, items: list) -> list:
+    """map() for blocking stat/scandir work, on threads when there is enough of it."""
+    if len(items) > SCAN_PARALLEL_THRESHOLD:
+        with ThreadPoolExecutor(max_workers=min(SCAN_MAX_WORKERS, len(items))) as executor:
+            return list(executor.map(fn, items))
+    return [fn(item) for item in items]
+
 
 @dataclass
 class ModelInfo:
@@ -33,54 +63,166 @@ class ModelInfo:
     quantization: Optional[str] = None
 
 
+SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+# Bit-width quantization markers in model names: 4bit / 4-bit
+MLX_QUANT_PATTERN = re.compile(r'([86432])-?bit', re.IGNORECASE)
+# Checked only when there is no bit-width marker, in this order
+MLX_FLOAT_QUANTS = ("fp16", "bf16")
+# GGUF quantization in a file name (model-Q4_K_M.gguf) or repo name (q4_k_m)
+GGUF_FILE_QUANT_PATTERN = re.compile(r'[_-]([qQ]\d+[_]?[kK]?[_]?[sSmMlL]?)')
+GGUF_SEARCH_QUANT_PATTERN = re.compile(r'[qQ](\d+)[_]?([kK])?[_]?([sSmMlL])?')
+
+
+def _detect_mlx_quantization(model_name: str) -> Optional[str]:
+    """Detect MLX quantization (e.g. 4BIT, BF16) from a model name.
+
+    Bit widths win over fp16/bf16 and wider bit widths win over narrower ones,
+    wherever they appear in the name ("x-bf16-4bit" is 4BIT).
+    """
+    bits = MLX_QUANT_PATTERN.findall(model_name)
+    if bits:
+        return f"{max(bits)}BIT"
+    name_lower = model_name.lower()
+    for quant in MLX_FLOAT_QUANTS:
+        if quant in name_lower:
+            return quant.upper()
+    return None
+
+
+def _read_config_quantization(config_path: str) -> Optional[str]:
+    """Read MLX quantization (e.g. 4BIT) from a model's config.json, if present."""
+    try:
+        with open(config_path) as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return None
+    quant = config.get("quantization") or config.get("quantization_config")
+    if isinstance(quant, dict) and isinstance(quant.get("bits"), int):
+        return f"{quant['bits']}BIT"
+    return None
+
+
 class ModelManager:
     """Manages local MLX models and HuggingFace downloads."""
 
+    # Shared across instances; HfApi holds a requests session
+    _hf_api = None
+    # (kind, *args) -> (monotonic timestamp, result) for search/model info lookups.
+    # Shared by request threads and asyncio.to_thread workers, hence the lock.
+    _hf_cache: Dict[tuple, Tuple[float, Any]] = {}
+    _hf_cache_lock = threading.Lock()
+
     def __init__(self):
-        self.downloads: Dict[str, Dict[str, Any]] = {}
+        # repo_id -> status, least recently updated first (capped at MAX_TRACKED_DOWNLOADS)
+        self.downloads: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
         self._download_lock = threading.Lock()
+        # (signature, models) from the last scan; signature is every model dir's stamp
+        self._list_cache: Optional[Tuple[tuple, List[ModelInfo]]] = None
+        # model_dir -> (stamp, models found in it); see _model_dir_stamp
+        self._model_cache: Dict[str, Tuple[tuple, List[ModelInfo]]] = {}
 
     def get_cache_dir(self) -> Path:
         """Get HuggingFace cache directory."""
         return HF_CACHE_DIR
 
     def list_local_models(self) -> List[ModelInfo]:
-        """List all MLX and GGUF models from LM Studio folder."""
-        models = []
-        seen_ids = set()
+        """List all MLX and GGUF models from LM Studio folder.
 
-        # Scan LM Studio models
-        if LMSTUDIO_MODELS_DIR.exists():
-            for author_dir in LMSTUDIO_MODELS_DIR.iterdir():
-                if not author_dir.is_dir():
-                    continue
-                author = author_dir.name
-
-                for model_dir in author_dir.iterdir():
-                    if not model_dir.is_dir():
-                        continue
-                    model_name = model_dir.name
-                    model_id = f"{author}/{model_name}"
-
-                    if model_id in seen_ids:
-                        continue
-
-                    # Check for GGUF files first
-                    gguf_info = self._scan_gguf_dir(model_id, model_name, model_dir)
-                    if gguf_info:
-                        models.extend(gguf_info)
-                        seen_ids.add(model_id)
-                        continue
-
-                    # Check for MLX model
-                    model_info = self._scan_model_dir(model_id, model_name, model_dir)
-                    if model_info:
-                        models.append(model_info)
-                        seen_ids.add(model_id)
+        Results are cached per model directory and reused until the mtime of
+        that directory or one of its subdirectories changes, i.e. a file is
+        added, removed or renamed at any depth. Files rewritten or grown in
+        place keep the cached entry. Only the LM Studio folder is listed;
+        HuggingFace cache downloads do not show up here.
+        """
+        model_dirs = self._list_model_dirs()
+        stamps = _map_io(lambda args: self._model_dir_stamp(args[2]), model_dirs)
+        signature = tuple((args[0], stamp) for args, stamp in zip(model_dirs, stamps))
+        list_cache = self._list_cache
+        if list_cache is not None and list_cache[0] == signature:
+            return list(list_cache[1])
+
+        model_cache = {}
+        to_scan = []
+        for (model_id, model_name, model_dir), stamp in zip(model_dirs, stamps):
+            cached = self._model_cache.get(model_dir)
+            if cached is not None and cached[0] == stamp:
+                model_cache[model_dir] = cached
+            else:
+                to_scan.append((model_id, model_name, model_dir, stamp))
+
+        def scan(args):
+            model_id, model_name, model_dir, _ = args
+            return self._scan_local_model(model_id, model_name, Path(model_dir))
+
+        for args, found in zip(to_scan, _map_io(scan, to_scan)):
+            model_cache[args[2]] = (args[3], found)
+
+        models = []
+        for _, _, model_dir in model_dirs:
+            models.extend(model_cache[model_dir][1])
 
         # Sort by name
         models.sort(key=lambda m: m.name.lower())
-        return models
+        self._model_cache = model_cache
+        self._list_cache = (signature, models)
+        return list(models)
+
+    def _list_model_dirs(self) -> List[Tuple[str, str, str]]:
+        """List (model_id, model_name, model_dir) for LM Studio model folders."""
+        model_dirs = []
+        try:
+            author_entries = sorted(os.scandir(LMSTUDIO_MODELS_DIR), key=lambda e: e.name)
+        except OSError:
+            return model_dirs
+
+        for author_entry in author_entries:
+            if not author_entry.is_dir():
+                continue
+            try:
+                model_entries = sorted(os.scandir(author_entry.path), key=lambda e: e.name)
+            except OSError:
+                continue
+            for model_entry in model_entries:
+                if not model_entry.is_dir():
+                    continue
+                model_dirs.append((
+                    f"{author_entry.name}/{model_entry.name}",
+                    model_entry.name,
+                    model_entry.path,
+                ))
+        return model_dirs
+
+    @staticmethod
+    def _model_dir_stamp(model_dir: str) -> tuple:
+        """(relative path, mtime_ns) of a model folder and each subfolder in it.
+
+        Only directories are stat'ed; scandir's entry types skip a stat per file.
+        """
+        stamp = []
+        prefix = len(model_dir)
+        stack = [model_dir]
+        while stack:
+            current = stack.pop()
+            try:
+                stamp.append((current[prefix:], os.stat(current).st_mtime_ns))
+                with os.scandir(current) as it:
+                    stack.extend(entry.path for entry in it if entry.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+        stamp.sort()
+        return tuple(stamp)
+
+    def _scan_local_model(self, model_id: str, model_name: str, model_dir: Path) -> List[ModelInfo]:
+        """Scan one LM Studio model folder for GGUF files or an MLX model."""
+        # Check for GGUF files first
+        gguf_info = self._scan_gguf_dir(model_id, model_name, model_dir)
+        if gguf_info:
+            return gguf_info
+
+        # Check for MLX model
+        model_info = self._scan_model_dir(model_id, model_name, model_dir)
+        return [model_info] if model_info else []
 
     def _scan_gguf_dir(self, model_id: str, model_name: str, model_path: Path) -> Optional[List[ModelInfo]]:
         """Scan a directory for GGUF files and return ModelInfo for each."""
@@ -94,9 +236,8 @@ class ModelManager:
             file_name = gguf_file.stem
 
             # Extract quantization from filename (Q4_K_M, Q5_K_S, etc.)
-            import re
             quantization = None
-            gguf_match = re.search(r'[_-]([qQ]\d+[_]?[kK]?[_]?[sSmMlL]?)', file_name)
+            gguf_match = GGUF_FILE_QUANT_PATTERN.search(file_name)
             if gguf_match:
                 quantization = gguf_match.group(1).upper()
 
@@ -114,33 +255,21 @@ class ModelManager:
 
     def _scan_model_dir(self, model_id: str, model_name: str, model_path: Path) -> Optional[ModelInfo]:
         """Scan a model directory and return ModelInfo if valid MLX model."""
-        # Check if it's an MLX model (has .safetensors files)
-        safetensor_files = list(model_path.glob("*.safetensors"))
-        if not safetensor_files:
-            # Check subdirectories
-            safetensor_files = list(model_path.rglob("*.safetensors"))
-
-        if not safetensor_files:
-            return None
-
         # Skip GGUF models (not MLX)
         if "gguf" in model_name.lower():
             return None
 
-        # Calculate size
-        size_bytes = sum(
-            f.stat().st_size
-            for f in model_path.rglob("*")
-            if f.is_file()
-        )
+        # Check if it's an MLX model (has .safetensors files) and calculate size
+        has_safetensors, size_bytes, config_path = self._walk_model(model_path)
+        if not has_safetensors:
+            return None
 
-        # Detect quantization from model name
+        # Detect quantization from config.json, falling back to the model name
         quantization = None
-        name_lower = model_name.lower()
-        for q in ["8bit", "6bit", "4bit", "3bit", "2bit", "fp16", "bf16"]:
-            if q in name_lower or q.replace("bit", "-bit") in name_lower:
-                quantization = q.upper()
-                break
+        if config_path:
+            quantization = _read_config_quantization(config_path)
+        if not quantization:
+            quantization = _detect_mlx_quantization(model_name)
 
         return ModelInfo(
             id=model_id,
@@ -152,13 +281,47 @@ class ModelManager:
             quantization=quantization
         )
 
+    @staticmethod
+    def _walk_model(model_path: Path) -> tuple:
+        """Walk a model directory once.
+
+        Returns (has_safetensors, total_size_bytes, config_path), where
+        config_path is the top-level config.json or None.
+
+        Uses os.scandir so file type checks reuse the directory entry instead
+        of an extra stat per file. Symlinked files (HF cache blobs) are counted
+        at their target size; symlinked directories are not followed.
+        """
+        has_safetensors = False
+        size_bytes = 0
+        config_path = None
+        root = str(model_path)
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file():
+                            size_bytes += entry.stat().st_size
+                            name = entry.name
+                            if not has_safetensors and name.endswith(".safetensors"):
+                                has_safetensors = True
+                            elif name == "config.json" and current == root:
+                                config_path = entry.path
+            except OSError:
+                continue
+        return has_safetensors, size_bytes, config_path
+
     def _format_size(self, size_bytes: int) -> str:
         """Format bytes to human readable string."""
-        for unit in ["B", "KB", "MB", "GB", "TB"]:
-            if size_bytes < 1024:
-                return f"{size_bytes:.1f} {unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.1f} PB"
+        if size_bytes <= 0:
+            return f"{size_bytes:.1f} B"
+        # Each unit is 2**10 of the previous one, so bit_length picks it directly
+        unit_idx = min((int(size_bytes).bit_length() - 1) // 10, len(SIZE_UNITS) - 1)
+        return f"{size_bytes / (1 << (10 * unit_idx)):.1f} {SIZE_UNITS[unit_idx]}"
 
     def start_download(self, repo_id: str) -> Dict[str, Any]:
         """Start downloading a model from HuggingFace."""
@@ -166,11 +329,11 @@ class ModelManager:
             if repo_id in self.downloads and self.downloads[repo_id].get("status") == "downloading":
                 return {"status": "already_downloading", "repo_id": repo_id}
 
-            self.downloads[repo_id] = {
+            self._set_download_status_locked(repo_id, {
                 "status": "starting",
                 "progress": 0,
                 "message": "Starting download..."
-            }
+            })
 
         # Start download in background thread
         thread = threading.Thread(
@@ -185,13 +348,14 @@ class ModelManager:
     def _download_model(self, repo_id: str):
         """Download model in background thread."""
         try:
-            from huggingface_hub import snapshot_download, HfApi
+            if snapshot_download is None:
+                raise RuntimeError("huggingface_hub is not installed")
 
-            self.downloads[repo_id] = {
+            self._set_download_status(repo_id, {
                 "status": "downloading",
                 "progress": 0,
                 "message": "Downloading model files..."
-            }
+            })
 
             # Download the model
             snapshot_download(
@@ -200,96 +364,140 @@ class ModelManager:
                 local_dir_use_symlinks=True,
             )
 
-            self.downloads[repo_id] = {
+            self._set_download_status(repo_id, {
                 "status": "completed",
                 "progress": 100,
                 "message": "Download complete!"
-            }
+            })
 
             logger.info(f"Successfully downloaded {repo_id}")
 
         except Exception as e:
             logger.error(f"Failed to download {repo_id}: {e}")
-            self.downloads[repo_id] = {
+            self._set_download_status(repo_id, {
                 "status": "error",
                 "progress": 0,
                 "message": str(e)
-            }
+            })
+
+    def _set_download_status(self, repo_id: str, status: Dict[str, Any]):
+        """Record a download's status under the download lock."""
+        with self._download_lock:
+            self._set_download_status_locked(repo_id, status)
+
+    def _set_download_status_locked(self, repo_id: str, status: Dict[str, Any]):
+        """Record a download's status, evicting the oldest finished entries past the cap."""
+        self.downloads[repo_id] = status
+        self.downloads.move_to_end(repo_id)
+        if len(self.downloads) > MAX_TRACKED_DOWNLOADS:
+            for old_id in [k for k, v in self.downloads.items() if v.get("status") in ("completed", "error")]:
+                if len(self.downloads) <= MAX_TRACKED_DOWNLOADS:
+                    break
+                del self.downloads[old_id]
 
     def get_download_status(self, repo_id: Optional[str] = None) -> Dict[str, Any]:
         """Get download status for one or all downloads."""
-        if repo_id:
-            return self.downloads.get(repo_id, {"status": "not_found"})
-        return dict(self.downloads)
-
-    def search_hf_models(self, query: str, limit: int = 20, backend: str = "all") -> List[Dict[str, Any]]:
+        with self._download_lock:
+            if repo_id:
+                return self.downloads.get(repo_id, {"status": "not_found"})
+            return dict(self.downloads)
+
+    def _api(self):
+        """Return the shared HfApi client, creating it on first use."""
+        if ModelManager._hf_api is None:
+            if HfApi is None:
+                raise RuntimeError("huggingface_hub is not installed")
+            ModelManager._hf_api = HfApi()
+        return ModelManager._hf_api
+
+    def _hf_cache_get(self, key: tuple) -> Optional[Any]:
+        """Return a cached HuggingFace API result if it is younger than HF_CACHE_TTL."""
+        with self._hf_cache_lock:
+            entry = self._hf_cache.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] > HF_CACHE_TTL:
+                self._hf_cache.pop(key, None)
+                return None
+            return entry[1]
+
+    def _hf_cache_put(self, key: tuple, value: Any):
+        """Cache a HuggingFace API result, evicting the oldest entry when full."""
+        with self._hf_cache_lock:
+            if key not in self._hf_cache and len(self._hf_cache) >= HF_CACHE_MAX_ENTRIES:
+                self._hf_cache.pop(next(iter(self._hf_cache)), None)
+            self._hf_cache[key] = (time.monotonic(), value)
+
+    async def search_hf_models_async(self, query: str, limit: int = 20, backend: str = "all") -> List[Dict[str, Any]]:
         """Search for MLX and GGUF models on HuggingFace.
 
+        The MLX and GGUF listings are fetched concurrently in worker threads.
+
         Args:
             query: Search query
             limit: Max results to return
             backend: Filter by backend - "mlx", "gguf", or "all" (default)
         """
+        cache_key = ("search", query, limit, backend)
+        cached = self._hf_cache_get(cache_key)
+        if cached is not None:
+            return [dict(result) for result in cached]
+
         try:
-            from huggingface_hub import HfApi
-
-            api = HfApi()
-            results = []
-            seen_ids = set()
-
-            # Search MLX models
-            if backend in ("mlx", "all"):
-                mlx_models = api.list_models(
-                    search=query,
-                    library="mlx",
-                    sort="downloads",
-                    direction=-1,
-                    limit=limit
-                )
-                for model in mlx_models:
-                    if model.id in seen_ids:
-                        continue
-                    seen_ids.add(model.id)
-                    results.append(self._format_search_result(model, "mlx"))
-
-            # Search GGUF models
-            if backend in ("gguf", "all"):
-                gguf_models = api.list_models(
-                    search=query,
-                    library="gguf",
-                    sort="downloads",
-                    direction=-1,
-                    limit=limit
-                )
-                for model in gguf_models:
-                    if model.id in seen_ids:
-                        continue
-                    seen_ids.add(model.id)
-                    results.append(self._format_search_result(model, "gguf"))
-
-            # Sort by downloads and limit
-            results.sort(key=lambda x: x["downloads"], reverse=True)
-            return results[:limit]
+            libraries = self._search_libraries(backend)
+            found = await asyncio.gather(*(
+                asyncio.to_thread(self._list_library_models, query, library, limit)
+                for library in libraries
+            ))
+            results = self._merge_search_results(libraries, found, limit)
+            self._hf_cache_put(cache_key, results)
+            return [dict(result) for result in results]
 
         except Exception as e:
             logger.error(f"HF search failed: {e}")
             return []
 
+    @staticmethod
+    def _search_libraries(backend: str) -> List[str]:
+        """HuggingFace library filters to query for a search backend."""
+        return [library for library in ("mlx", "gguf") if backend in (library, "all")]
+
+    def _list_library_models(self, query: str, library: str, limit: int) -> list:
+        """Fetch one page of HuggingFace models for a library, most downloaded first."""
+        # list_models is lazy - materialize so the request runs here (and in the worker thread)
+        return list(self._api().list_models(
+            search=query,
+            library=library,
+            sort="downloads",
+            direction=-1,
+            limit=limit
+        ))
+
+    def _merge_search_results(self, libraries: List[str], found: List[list], limit: int) -> List[Dict[str, Any]]:
+        """Dedupe per-library search hits, sort by downloads and apply limit."""
+        results = []
+        seen_ids = set()
+        for library, models in zip(libraries, found):
+            for model in models:
+                if model.id in seen_ids:
+                    continue
+                seen_ids.add(model.id)
+                results.append(self._format_search_result(model, library))
+
+        # Sort by downloads and limit
+        results.sort(key=lambda x: x["downloads"], reverse=True)
+        return results[:limit]
+
     def _format_search_result(self, model, backend: str) -> Dict[str, Any]:
         """Format a HuggingFace model into search result dict."""
         model_name = model.id.split("/")[-1].lower()
 
         # Extract quantization from model name
-        quantization = None
         # MLX quantizations
-        for q in ["8bit", "6bit", "4bit", "3bit", "2bit", "fp16", "bf16"]:
-            if q in model_name or q.replace("bit", "-bit") in model_name:
-                quantization = q.upper()
-                break
+        quantization = _detect_mlx_quantization(model_name)
         # GGUF quantizations (Q4_K_M, Q5_K_S, etc.)
         if not quantization:
-            import re
-            gguf_match = re.search(r'[qQ](\d+)[_]?([kK])?[_]?([sSmMlL])?', model_name)
+            gguf_match = GGUF_SEARCH_QUANT_PATTERN.search(model_name)
             if gguf_match:
                 q_level = gguf_match.group(1)
                 k_type = gguf_match.group(2) or ""
@@ -309,13 +517,15 @@ class ModelManager:
 
     def get_model_info(self, repo_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed info about a model from HuggingFace."""
-        try:
-            from huggingface_hub import HfApi
+        cache_key = ("info", repo_id)
+        cached = self._hf_cache_get(cache_key)
+        if cached is not None:
+            return dict(cached)
 
-            api = HfApi()
-            model = api.model_info(repo_id)
+        try:
+            model = self._api().model_info(repo_id)
 
-            return {
+            info = {
                 "id": model.id,
                 "name": model.id.split("/")[-1],
                 "author": model.author or model.id.split("/")[0],
@@ -325,6 +535,8 @@ class ModelManager:
                 "created_at": model.created_at.isoformat() if model.created_at else None,
                 "last_modified": model.last_modified.isoformat() if model.last_modified else None,
             }
+            self._hf_cache_put(cache_key, info)
+            return dict(info)
 
         except Exception as e:
             logger.error(f"Failed to get model info for {repo_id}: {e}")
@@ -8,7 +8,7 @@ from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProfileSettings:
     """Settings for an inference profile."""
     name: str
@@ -80,6 +80,15 @@ PROFILES: Dict[str, ProfileSettings] = {
     )
 }
 
+# Profiles are immutable, so their dict form is built once
+_PROFILE_DICTS: Dict[str, Dict[str, Any]] = {k: v.to_dict() for k, v in PROFILES.items()}
+
+# Generation parameters a profile supplies to apply_to_params
+_PARAM_KEYS = ('temperature', 'top_p', 'max_tokens', 'prefill_step_size', 'kv_bits')
+_PROFILE_PARAMS: Dict[str, Dict[str, Any]] = {
+    k: {key: d[key] for key in _PARAM_KEYS} for k, d in _PROFILE_DICTS.items()
+}
+
 
 class InferenceProfiles:
     """Manager for inference profiles."""
@@ -91,7 +100,7 @@ class InferenceProfiles:
     def get_all(self) -> Dict[str, Any]:
         """Get all available profiles."""
         return {
-            'profiles': {k: v.to_dict() for k, v in self.profiles.items()},
+            'profiles': dict(_PROFILE_DICTS),
             'current': self.current_profile
         }
 
@@ -111,7 +120,7 @@ class InferenceProfiles:
         return {
             'status': 'changed',
             'profile': name,
-            'settings': self.profiles[name].to_dict()
+            'settings': _PROFILE_DICTS[name]
         }
 
     def apply_to_params(
@@ -128,12 +137,12 @@ class InferenceProfiles:
 
         Returns dict with resolved generation parameters.
         """
-        profile = self.profiles.get(profile_name or self.current_profile)
-
-        return {
-            'temperature': temperature if temperature is not None else profile.temperature,
-            'top_p': top_p if top_p is not None else profile.top_p,
-            'max_tokens': max_tokens if max_tokens is not None else profile.max_tokens,
-            'prefill_step_size': prefill_step_size if prefill_step_size is not None else profile.prefill_step_size,
-            'kv_bits': kv_bits if kv_bits is not None else profile.kv_bits
+        base = _PROFILE_PARAMS[profile_name or self.current_profile]
+        explicit = {
+            'temperature': temperature,
+            'top_p': top_p,
+            'max_tokens': max_tokens,
+            'prefill_step_size': prefill_step_size,
+            'kv_bits': kv_bits
         }
+        return {**base, **{k: v for k, v in explicit.items() if v is not None}}
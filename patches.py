@@ -6,79 +6,180 @@ and newer versions of mlx-lm.
 """
 
 import json
+import logging
+import os
 import re
+import time
+import uuid
 import fnmatch
+import functools
 from pathlib import Path
 
+# Optional faster JSON parsing. Not via extensions.fast_json: importing the
+# extensions package here would pull in mlx-omni-server before it is patched.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("mlx-studio.patches")
+
 # Model aliases - loaded from config file
 _MODEL_ALIASES = {}
 ALIASES_FILE = Path(__file__).parent / "model_aliases.json"
+_aliases_mtime = None  # st_mtime_ns of the loaded file
+_aliases_loaded = False  # set once load_aliases() has run, even if the file is missing
+# (compiled regex, pattern, target) for wildcard alias keys, rebuilt on load
+_WILDCARD_ALIASES = []
 
 # Claude model routing configuration
 _ROUTING_CONFIG = {}
 ROUTING_FILE = Path(__file__).parent / "claude_routing.json"
+_routing_mtime = None  # st_mtime_ns of the loaded file
+_routing_loaded = False  # set once load_routing_config() has run
+# (compiled regex, tier) for _ROUTING_CONFIG["patterns"], rebuilt on load
+_COMPILED_TIER_PATTERNS = []
+
 
+def _read_json(path: Path):
+    """Parse a JSON config file (orjson when installed)."""
+    data = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def load_aliases():
-    """Load model aliases from config file."""
-    global _MODEL_ALIASES
-    if ALIASES_FILE.exists():
-        try:
-            with open(ALIASES_FILE) as f:
-                _MODEL_ALIASES = json.load(f)
-        except Exception:
-            pass
+    """Load model aliases from config file (re-parsed only when its mtime changes)."""
+    global _MODEL_ALIASES, _aliases_mtime, _aliases_loaded
+    _aliases_loaded = True
+    try:
+        mtime = ALIASES_FILE.stat().st_mtime_ns
+    except OSError:
+        return _MODEL_ALIASES
+    if mtime == _aliases_mtime:
+        return _MODEL_ALIASES
+    try:
+        _MODEL_ALIASES = _read_json(ALIASES_FILE)
+        _aliases_mtime = mtime
+        resolve_alias_with_backend.cache_clear()
+        _resolve_generator_models.cache_clear()
+    except Exception:
+        pass
+    _compile_wildcard_aliases()
     return _MODEL_ALIASES
 
 
+def _compile_wildcard_aliases():
+    """Compile the wildcard alias keys once instead of fnmatch-ing them per request."""
+    global _WILDCARD_ALIASES
+    _WILDCARD_ALIASES = [
+        (re.compile(fnmatch.translate(pattern)), pattern, target)
+        for pattern, target in _MODEL_ALIASES.items()
+        if '*' in pattern or '?' in pattern
+    ]
+
+
 def reload_aliases():
     """Force reload of aliases configuration (called from routers)."""
-    global _MODEL_ALIASES
+    global _MODEL_ALIASES, _aliases_mtime, _WILDCARD_ALIASES
     _MODEL_ALIASES = {}
+    _aliases_mtime = None
+    _WILDCARD_ALIASES = []
+    resolve_alias_with_backend.cache_clear()
+    _resolve_generator_models.cache_clear()
     return load_aliases()
 
 
 def load_routing_config():
-    """Load Claude routing configuration."""
-    global _ROUTING_CONFIG
-    if ROUTING_FILE.exists():
-        try:
-            with open(ROUTING_FILE) as f:
-                _ROUTING_CONFIG = json.load(f)
-        except Exception:
-            pass
+    """Load Claude routing configuration (re-parsed only when its mtime changes)."""
+    global _ROUTING_CONFIG, _routing_mtime, _routing_loaded
+    _routing_loaded = True
+    try:
+        mtime = ROUTING_FILE.stat().st_mtime_ns
+    except OSError:
+        return _ROUTING_CONFIG
+    if mtime == _routing_mtime:
+        return _ROUTING_CONFIG
+    try:
+        _ROUTING_CONFIG = _read_json(ROUTING_FILE)
+        _routing_mtime = mtime
+        resolve_alias_with_backend.cache_clear()
+        _resolve_generator_models.cache_clear()
+        get_tier_config.cache_clear()
+    except Exception:
+        pass
+    _compile_tier_patterns()
     return _ROUTING_CONFIG
 
 
+def _compile_tier_patterns():
+    """Compile the routing config's tier patterns once instead of per request."""
+    global _COMPILED_TIER_PATTERNS
+    compiled = []
+    for pattern, tier in (_ROUTING_CONFIG.get("patterns") or {}).items():
+        try:
+            compiled.append((re.compile(pattern, re.IGNORECASE), tier))
+        except re.error as e:
+            logger.warning("Ignoring invalid routing pattern %r: %s", pattern, e)
+    _COMPILED_TIER_PATTERNS = compiled
+    _detect_claude_tier.cache_clear()
+
+
 def reload_routing_config():
     """Force reload of routing configuration (called from server.py)."""
-    global _ROUTING_CONFIG
+    global _ROUTING_CONFIG, _routing_mtime, _COMPILED_TIER_PATTERNS
     _ROUTING_CONFIG = {}
+    _routing_mtime = None
+    _COMPILED_TIER_PATTERNS = []
+    _detect_claude_tier.cache_clear()
+    resolve_alias_with_backend.cache_clear()
+    _resolve_generator_models.cache_clear()
+    get_tier_config.cache_clear()
     return load_routing_config()
 
 
+# Fallback keyword -> tier, checked in order when no config pattern matches
+_TIER_KEYWORDS = (("haiku", "haiku"), ("opus", "opus"), ("sonnet", "sonnet"))
+
+
+@functools.lru_cache(maxsize=128)
 def _detect_claude_tier(model_id: str) -> str:
-    """Detect which tier (haiku/sonnet/opus) a Claude model ID belongs to."""
-    model_lower = model_id.lower()
+    """Detect which tier (haiku/sonnet/opus) a Claude model ID belongs to.
 
+    Cached per model ID; the cache is cleared whenever the tier patterns change.
+    """
     # Check patterns from config first
-    if _ROUTING_CONFIG.get("patterns"):
-        for pattern, tier in _ROUTING_CONFIG["patterns"].items():
-            if re.match(pattern, model_id, re.IGNORECASE):
-                return tier
+    for pattern, tier in _COMPILED_TIER_PATTERNS:
+        if pattern.match(model_id):
+            return tier
 
     # Fallback to simple keyword matching
-    if "haiku" in model_lower:
-        return "haiku"
-    elif "opus" in model_lower:
-        return "opus"
-    elif "sonnet" in model_lower:
-        return "sonnet"
+    model_lower = model_id.lower()
+    for keyword, tier in _TIER_KEYWORDS:
+        if keyword in model_lower:
+            return tier
 
     return "sonnet"  # Default to sonnet if unknown
 
 
+def _claude_tier(model_id: str):
+    """Return the routing tier for a claude-* model ID, or None for other models."""
+    if model_id.startswith("claude-"):
+        return _detect_claude_tier(model_id)
+    return None
+
+
+# Tool call start markers watched for by the stream debug adapter
+TOOL_MARKERS = ('<tool_call>', '<function=')
+TOOL_MARKER_PATTERN = re.compile('|'.join(map(re.escape, TOOL_MARKERS)))
+# Tail of the stream buffer held back in case it is the start of a marker
+MAX_MARKER_LEN = max(len(m) for m in TOOL_MARKERS)
+
+# Case-insensitive ".gguf" anywhere in a model path, without lowercasing a copy
+GGUF_PATH_PATTERN = re.compile(r'\.gguf', re.IGNORECASE)
+
+
 def _detect_backend(model_path: str, tier_config: dict = None) -> str:
     """Detect which backend to use for a model.
 
@@ -93,24 +194,18 @@ def _detect_backend(model_path: str, tier_config: dict = None) -> str:
     if tier_config and tier_config.get("backend"):
         return tier_config["backend"]
 
-    # 2. Check file extension
-    if model_path.endswith(".gguf"):
-        return "gguf"
-
-    # 3. Check if path looks like GGUF (contains .gguf anywhere)
-    if ".gguf" in model_path.lower():
+    # 2. Check if path looks like GGUF (.gguf extension or anywhere, any case)
+    if GGUF_PATH_PATTERN.search(model_path):
         return "gguf"
 
     # Default to MLX
     return "mlx"
 
 
+@functools.lru_cache(maxsize=128)
 def _expand_path(path: str) -> str:
-    """Expand ~ and environment variables in path."""
-    import os
-    if path.startswith("~"):
-        path = os.path.expanduser(path)
-    return os.path.expandvars(path)
+    """Expand ~ and environment variables in path (cached - config paths repeat)."""
+    return os.path.expandvars(os.path.expanduser(path))
 
 
 def resolve_alias(model_id: str) -> str:
@@ -127,9 +222,13 @@ def resolve_alias(model_id: str) -> str:
     return resolved
 
 
+@functools.lru_cache(maxsize=256)
 def resolve_alias_with_backend(model_id: str) -> tuple:
     """Resolve a model alias and determine the backend to use.
 
+    Results are cached, so the resolution is only logged the first time a
+    model ID is seen; reload_aliases() and reload_routing_config() clear the cache.
+
     Supports wildcards using fnmatch patterns:
     - claude-haiku-* matches claude-haiku-4-5-20251001, claude-haiku-3, etc.
     - claude-* matches any claude model
@@ -139,9 +238,9 @@ def resolve_alias_with_backend(model_id: str) -> tuple:
         Tuple of (resolved_model_id, backend_type)
         backend_type is 'mlx' or 'gguf'
     """
-    if not _MODEL_ALIASES:
+    if not _aliases_loaded:
         load_aliases()
-    if not _ROUTING_CONFIG:
+    if not _routing_loaded:
         load_routing_config()
 
     tier_config = None
@@ -150,34 +249,31 @@ def resolve_alias_with_backend(model_id: str) -> tuple:
     if model_id in _MODEL_ALIASES:
         resolved = _expand_path(_MODEL_ALIASES[model_id])
         backend = _detect_backend(resolved)
-        print(f"[patches] Resolved alias '{model_id}' -> '{resolved}' (backend={backend})")
+        logger.info("Resolved alias %r -> %r (backend=%s)", model_id, resolved, backend)
         return resolved, backend
 
-    # 2. Wildcard pattern matching in aliases
-    # Check each alias key to see if it's a pattern that matches model_id
-    for pattern, target in _MODEL_ALIASES.items():
-        # Only check patterns that contain wildcards
-        if '*' in pattern or '?' in pattern:
-            if fnmatch.fnmatch(model_id, pattern):
-                resolved = _expand_path(target)
-                backend = _detect_backend(resolved)
-                print(f"[patches] Resolved wildcard alias '{pattern}' for '{model_id}' -> '{resolved}' (backend={backend})")
-                return resolved, backend
+    # 2. Wildcard pattern matching in aliases (keys with * or ?, in file order)
+    for regex, pattern, target in _WILDCARD_ALIASES:
+        if regex.match(model_id):
+            resolved = _expand_path(target)
+            backend = _detect_backend(resolved)
+            logger.info("Resolved wildcard alias %r for %r -> %r (backend=%s)", pattern, model_id, resolved, backend)
+            return resolved, backend
 
     # 3. Claude model routing (for claude-* models not matched by aliases)
-    if model_id.startswith("claude-"):
+    tier = _claude_tier(model_id)
+    if tier is not None:
         routing_enabled = _ROUTING_CONFIG.get("enabled", True)
 
         if routing_enabled:
-            # Detect tier and get configured model
-            tier = _detect_claude_tier(model_id)
+            # Get the tier's configured model
             tier_config = _ROUTING_CONFIG.get("tiers", {}).get(tier, {})
             tier_model = tier_config.get("model")
 
             if tier_model:
                 resolved = _expand_path(tier_model)
                 backend = _detect_backend(resolved, tier_config)
-                print(f"[patches] Routed Claude '{model_id}' ({tier}) -> '{resolved}' (backend={backend})")
+                logger.info("Routed Claude %r (%s) -> %r (backend=%s)", model_id, tier, resolved, backend)
                 return resolved, backend
 
         # Fallback to default_model from routing config
@@ -185,7 +281,7 @@ def resolve_alias_with_backend(model_id: str) -> tuple:
         if default_model:
             resolved = _expand_path(default_model)
             backend = _detect_backend(resolved)
-            print(f"[patches] Routed Claude '{model_id}' (default) -> '{resolved}' (backend={backend})")
+            logger.info("Routed Claude %r (default) -> %r (backend=%s)", model_id, resolved, backend)
             return resolved, backend
 
         # Final fallback to aliases
@@ -193,7 +289,7 @@ def resolve_alias_with_backend(model_id: str) -> tuple:
         if fallback:
             resolved = _expand_path(fallback)
             backend = _detect_backend(resolved)
-            print(f"[patches] Resolved Claude model '{model_id}' -> '{resolved}' (fallback, backend={backend})")
+            logger.info("Resolved Claude model %r -> %r (fallback, backend=%s)", model_id, resolved, backend)
             return resolved, backend
 
     # No resolution - detect backend from original model_id
@@ -203,12 +299,12 @@ def resolve_alias_with_backend(model_id: str) -> tuple:
 
 def get_draft_model_for(model_id: str) -> str:
     """Get the draft model configured for a model (for speculative decoding)."""
-    if not _ROUTING_CONFIG:
+    if not _routing_loaded:
         load_routing_config()
 
     # Check if this is a Claude model with tier-specific draft model
-    if model_id.startswith("claude-"):
-        tier = _detect_claude_tier(model_id)
+    tier = _claude_tier(model_id)
+    if tier is not None:
         tier_config = _ROUTING_CONFIG.get("tiers", {}).get(tier, {})
         draft_model = tier_config.get("draft_model")
         if draft_model:
@@ -217,6 +313,30 @@ def get_draft_model_for(model_id: str) -> str:
     return None
 
 
+@functools.lru_cache(maxsize=64)
+def _resolve_generator_models(model_id: str, draft_model_id: str = None) -> tuple:
+    """Resolve (model, draft model) for ChatGenerator.get_or_create.
+
+    Cached per argument pair; cleared together with resolve_alias() on config reloads.
+    """
+    if draft_model_id is None:
+        # Check for configured draft model (speculative decoding)
+        configured_draft = get_draft_model_for(model_id)
+        if configured_draft:
+            # Resolve draft model alias too
+            draft_model_id = resolve_alias(configured_draft)
+    return resolve_alias(model_id), draft_model_id
+
+
+# Default values per tier
+TIER_DEFAULTS = {
+    "haiku": {"context_length": 32768, "max_tokens": 4096},      # Small/fast model
+    "sonnet": {"context_length": 131072, "max_tokens": 16384},   # Medium model
+    "opus": {"context_length": 131072, "max_tokens": 32000},     # Large model
+}
+
+
+@functools.lru_cache(maxsize=8)
 def get_tier_config(tier: str) -> dict:
     """Get the configuration for a specific tier (haiku/sonnet/opus).
 
@@ -224,20 +344,15 @@ def get_tier_config(tier: str) -> dict:
         tier: One of 'haiku', 'sonnet', 'opus'
 
     Returns:
-        Dict with 'model', 'draft_model', 'backend', 'context_length', 'max_tokens' keys
+        Dict with 'model', 'draft_model', 'backend', 'context_length', 'max_tokens' keys.
+        The dict is cached until the routing config is reloaded and shared
+        between callers - do not mutate it.
     """
-    if not _ROUTING_CONFIG:
+    if not _routing_loaded:
         load_routing_config()
 
-    # Default values per tier
-    tier_defaults = {
-        "haiku": {"context_length": 32768, "max_tokens": 4096},      # Small/fast model
-        "sonnet": {"context_length": 131072, "max_tokens": 16384},   # Medium model
-        "opus": {"context_length": 131072, "max_tokens": 32000},     # Large model
-    }
-
     config = _ROUTING_CONFIG.get("tiers", {}).get(tier, {})
-    defaults = tier_defaults.get(tier, {"context_length": 65536, "max_tokens": 8192})
+    defaults = TIER_DEFAULTS.get(tier, {"context_length": 65536, "max_tokens": 8192})
 
     # Merge with defaults
     return {
@@ -258,13 +373,10 @@ def get_tier_for_model(model_id: str) -> str:
     Returns:
         Tier name ('haiku', 'sonnet', 'opus') or 'sonnet' as default
     """
-    if not _ROUTING_CONFIG:
+    if not _routing_loaded:
         load_routing_config()
 
-    if model_id.startswith("claude-"):
-        return _detect_claude_tier(model_id)
-
-    return "sonnet"  # Default
+    return _claude_tier(model_id) or "sonnet"  # Default
 
 
 # Models that use RotatingKVCache and don't support kv_bits quantization
@@ -272,22 +384,31 @@ ROTATING_KV_CACHE_MODELS = [
     "gpt-oss",
     "openai-gpt-oss",
 ]
+ROTATING_KV_CACHE_PATTERN = re.compile(
+    "|".join(map(re.escape, ROTATING_KV_CACHE_MODELS)), re.IGNORECASE
+)
 
 
+@functools.lru_cache(maxsize=64)
 def model_supports_kv_quantization(model_id: str) -> bool:
     """Check if a model supports KV cache quantization.
 
     Some models use RotatingKVCache which doesn't support quantization yet.
     """
-    model_lower = model_id.lower()
-    for pattern in ROTATING_KV_CACHE_MODELS:
-        if pattern in model_lower:
-            return False
-    return True
+    return ROTATING_KV_CACHE_PATTERN.search(model_id) is None
+
+
+# Set once apply_patches() has run, so a second call does not wrap methods twice
+_PATCHES_APPLIED = False
 
 
 def apply_patches():
-    """Apply all necessary patches to mlx-omni-server."""
+    """Apply all necessary patches to mlx-omni-server (only the first call does anything)."""
+    global _PATCHES_APPLIED
+    if _PATCHES_APPLIED:
+        return
+    _PATCHES_APPLIED = True
+
     _patch_mlx_lm_utils()
     _patch_chat_generator()
     _patch_kv_bits_for_rotating_cache()
@@ -301,6 +422,20 @@ def apply_patches():
     # _patch_chat_template_tools()  # Disabled - mlx-omni-server has native Qwen3 tool support
 
 
+def _is_patched(target, name: str) -> bool:
+    """True if patch `name` was already applied to `target`, so each _patch_* wraps once."""
+    return getattr(target, f"_mlx_studio_{name}_patched", False)
+
+
+def _mark_patched(target, name: str):
+    """Record that patch `name` was applied to `target`.
+
+    Called only after the wrappers are installed, so a patch that raised
+    partway through is retried instead of being recorded as applied.
+    """
+    setattr(target, f"_mlx_studio_{name}_patched", True)
+
+
 def _patch_mlx_lm_utils():
     """
     Patch mlx_lm.utils for compatibility with mlx-omni-server.
@@ -311,6 +446,9 @@ def _patch_mlx_lm_utils():
     """
     import mlx_lm.utils as mlx_utils
 
+    if _is_patched(mlx_utils, "compat"):
+        return
+
     # Patch 1: Add get_model_path if missing
     if not hasattr(mlx_utils, 'get_model_path'):
         def get_model_path(model_id: str):
@@ -338,6 +476,7 @@ def _patch_mlx_lm_utils():
         return original_load_config(model_path, **kwargs)
 
     mlx_utils.load_config = patched_load_config
+    _mark_patched(mlx_utils, "compat")
 
 
 def _patch_chat_generator():
@@ -346,25 +485,27 @@ def _patch_chat_generator():
     """
     from mlx_omni_server.chat.mlx.chat_generator import ChatGenerator
 
+    if _is_patched(ChatGenerator, "alias"):
+        return
+
     original_get_or_create = ChatGenerator.get_or_create
 
     @classmethod
     def patched_get_or_create(cls, model_id: str, adapter_path=None, draft_model_id=None):
         """Wrapper that resolves model aliases and applies draft model configuration."""
-        # Resolve main model alias
-        resolved_model_id = resolve_alias(model_id)
-
-        # Check for configured draft model (speculative decoding)
-        if draft_model_id is None:
-            configured_draft = get_draft_model_for(model_id)
-            if configured_draft:
-                # Resolve draft model alias too
-                draft_model_id = resolve_alias(configured_draft)
-                print(f"[patches] Using draft model '{draft_model_id}' for speculative decoding")
+        resolved_model_id, resolved_draft = _resolve_generator_models(model_id, draft_model_id)
+        if resolved_draft is not None and draft_model_id is None:
+            logger.debug("Using draft model %r for speculative decoding", resolved_draft)
 
-        return original_get_or_create.__func__(cls, resolved_model_id, adapter_path, draft_model_id)
+        return original_get_or_create.__func__(cls, resolved_model_id, adapter_path, resolved_draft)
 
     ChatGenerator.get_or_create = patched_get_or_create
+    _mark_patched(ChatGenerator, "alias")
+
+
+# Qwen3 tool call XML stripped from display content in _patch_chat_template_tools:
+# well-formed <tool_call> blocks and malformed ones missing the opening tag, in one pass
+TOOL_CALL_BLOCK_PATTERN = re.compile(r'(?:<tool_call>|<function=).*?</tool_call>', re.DOTALL)
 
 
 def _patch_chat_template_tools():
@@ -380,7 +521,9 @@ def _patch_chat_template_tools():
     from mlx_omni_server.chat.mlx.tools.chat_template import ChatTemplate
     from mlx_omni_server.chat.mlx.tools.qwen3_moe_tools_parser import Qwen3MoeToolParser
     from mlx_omni_server.chat.mlx.core_types import ChatTemplateResult
-    import re
+
+    if _is_patched(ChatTemplate, "qwen3_tools"):
+        return
 
     # Create parser for Qwen3 format
     qwen3_parser = Qwen3MoeToolParser()
@@ -392,40 +535,30 @@ def _patch_chat_template_tools():
         # First, run the original parse for thinking extraction etc.
         result = original_parse(self, text)
 
-        # If tools were not sent in request but text contains tool calls,
-        # try to parse them with Qwen3 format
-        if not self.has_tools and result.content:
-            # Check if content looks like it has tool calls
-            if '<function=' in result.content or '<tool_call>' in result.content:
-                tool_calls = qwen3_parser.parse_tools(result.content)
-
-                if tool_calls:
-                    # Extract content before the tool call (intro text)
-                    content_before_tool = result.content
-                    # Remove tool call XML from display content
-                    content_before_tool = re.sub(
-                        r'<tool_call>.*?</tool_call>',
-                        '',
-                        content_before_tool,
-                        flags=re.DOTALL
-                    ).strip()
-                    # Also handle malformed (missing opening tag)
-                    content_before_tool = re.sub(
-                        r'<function=.*?</tool_call>',
-                        '',
-                        content_before_tool,
-                        flags=re.DOTALL
-                    ).strip()
-
-                    return ChatTemplateResult(
-                        content=content_before_tool,
-                        thinking=result.thinking,
-                        tool_calls=tool_calls
-                    )
-
-        return result
+        # Only when tools were not sent in the request - otherwise the original
+        # parse already handled them
+        if self.has_tools:
+            return result
+        content = result.content
+        if not content:
+            return result
+
+        # Check if content looks like it has tool calls, then parse with Qwen3 format
+        if '<function=' not in content and '<tool_call>' not in content:
+            return result
+        tool_calls = qwen3_parser.parse_tools(content)
+        if not tool_calls:
+            return result
+
+        # Remove tool call XML from display content, keeping the intro text
+        return ChatTemplateResult(
+            content=TOOL_CALL_BLOCK_PATTERN.sub('', content).strip(),
+            thinking=result.thinking,
+            tool_calls=tool_calls
+        )
 
     ChatTemplate.parse_chat_response = patched_parse
+    _mark_patched(ChatTemplate, "qwen3_tools")
     print("[patches] Enabled Qwen3 tool call parsing")
 
 
@@ -436,6 +569,9 @@ def _patch_kv_bits_for_rotating_cache():
     """
     from mlx_omni_server.chat.mlx.chat_generator import ChatGenerator
 
+    if _is_patched(ChatGenerator, "kv_bits"):
+        return
+
     original_create_mlx_kwargs = ChatGenerator._create_mlx_kwargs
 
     def patched_create_mlx_kwargs(self, sampler=None, max_tokens=4096, **kwargs):
@@ -446,12 +582,13 @@ def _patch_kv_bits_for_rotating_cache():
         model_id = getattr(self.model, 'model_id', '') or ''
         if not model_supports_kv_quantization(model_id):
             if 'kv_bits' in result:
-                print(f"[patches] Disabling kv_bits for model '{model_id}' (uses RotatingKVCache)")
+                logger.info("Disabling kv_bits for model %r (uses RotatingKVCache)", model_id)
                 del result['kv_bits']
 
         return result
 
     ChatGenerator._create_mlx_kwargs = patched_create_mlx_kwargs
+    _mark_patched(ChatGenerator, "kv_bits")
     print("[patches] Added RotatingKVCache compatibility for kv_bits")
 
 
@@ -463,7 +600,9 @@ def _patch_stream_generation_debug():
     """
     from mlx_omni_server.chat.mlx.chat_generator import ChatGenerator
     from mlx_omni_server.chat.openai.openai_adapter import OpenAIAdapter
-    import logging
+
+    if _is_patched(ChatGenerator, "stream_debug"):
+        return
 
     logger = logging.getLogger("mlx-studio.stream-debug")
 
@@ -503,24 +642,21 @@ def _patch_stream_generation_debug():
             raise
 
     ChatGenerator.generate_stream = patched_generate_stream
+    _mark_patched(ChatGenerator, "stream_debug")
 
     # Patch 2: OpenAI adapter to log tool call detection
     original_generate_stream_adapter = OpenAIAdapter.generate_stream
 
     def patched_generate_stream_adapter(self, request):
         """Wrapper that logs tool call marker detection."""
-        import time
         from mlx_omni_server.chat.openai.schema import ChatMessage, ChatCompletionChunk, ChatCompletionChunkChoice, Role
 
-        chat_id = f"chatcmpl-{__import__('uuid').uuid4().hex[:10]}"
-        accumulated_text = ""
+        chat_id = f"chatcmpl-{uuid.uuid4().hex[:10]}"
+        accumulated_chars = 0  # only the length is logged, so the text is not kept
         buffer = ""
         in_tool_call = False
         result = None
 
-        TOOL_MARKERS = ['<tool_call>', '<function=']
-        MAX_MARKER_LEN = max(len(m) for m in TOOL_MARKERS)
-
         include_thinking = (
             request.stream_options.include_thinking
             if request.stream_options
@@ -533,7 +669,7 @@ def _patch_stream_generation_debug():
 
                 if chunk.content.text_delta:
                     content = chunk.content.text_delta
-                    accumulated_text += content
+                    accumulated_chars += len(content)
                 elif chunk.content.reasoning_delta:
                     if include_thinking:
                         content = chunk.content.reasoning_delta
@@ -551,15 +687,14 @@ def _patch_stream_generation_debug():
                 if not in_tool_call:
                     buffer += content
 
-                    # Check if buffer contains start of tool call
-                    for marker in TOOL_MARKERS:
-                        if marker in buffer:
-                            logger.warning(f"⚠️ TOOL MARKER DETECTED: '{marker}' in buffer context: '{buffer[-100:]}'")
-                            logger.warning(f"   Accumulated text so far: {len(accumulated_text)} chars")
-                            logger.warning(f"   Stopping stream to parse tool call")
-                            in_tool_call = True
-                            buffer = ""
-                            break
+                    # Check if buffer contains start of tool call (one pass for all markers)
+                    marker_match = TOOL_MARKER_PATTERN.search(buffer)
+                    if marker_match:
+                        logger.warning(f"⚠️ TOOL MARKER DETECTED: '{marker_match.group(0)}' in buffer context: '{buffer[-100:]}'")
+                        logger.warning(f"   Accumulated text so far: {accumulated_chars} chars")
+                        logger.warning(f"   Stopping stream to parse tool call")
+                        in_tool_call = True
+                        buffer = ""
 
                     # If not in tool call, yield buffered content
                     if not in_tool_call and len(buffer) > MAX_MARKER_LEN:
@@ -2,6 +2,7 @@
 Cache API endpoints - KV cache, prompt cache, and pre-warm system.
 """
 import os
+import time
 import logging
 import threading
 import hashlib
@@ -11,6 +12,7 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 
 from extensions import KVCacheManager
+from patches import get_tier_config, resolve_alias_with_backend
 
 logger = logging.getLogger("mlx-studio.cache")
 router = APIRouter(prefix="/api", tags=["Cache"])
@@ -31,7 +33,7 @@ def set_mlx_lock(lock: threading.Lock):
 # Pre-warm System
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class PrewarmState:
     """Track pre-warm state for cross-model cache optimization."""
     last_system_prompt_hash: str = ""
@@ -42,10 +44,18 @@ class PrewarmState:
 _prewarm_state = PrewarmState()
 _prewarm_lock = threading.Lock()
 
+# (system content, hash) of the last prompt hashed - multi-turn chats repeat it
+_last_system_prompt_hash = ("", "")
+
 
 def _compute_system_prompt_hash(messages: list) -> str:
-    """Compute hash of system prompt for change detection."""
-    system_content = ""
+    """Compute hash of system prompt for change detection.
+
+    An unchanged system prompt (the usual case across turns) is compared
+    against the last one instead of being hashed again.
+    """
+    global _last_system_prompt_hash
+    parts = []
     for m in messages:
         role = m.get("role", "")
         if role == "system":
@@ -53,12 +63,19 @@ def _compute_system_prompt_hash(messages: list) -> str:
             if isinstance(content, list):
                 for block in content:
                     if isinstance(block, dict) and block.get("type") == "text":
-                        system_content += block.get("text", "")
+                        parts.append(block.get("text", ""))
             else:
-                system_content += str(content)
+                parts.append(str(content))
+    system_content = "".join(parts)
     if not system_content:
         return ""
-    return hashlib.sha256(system_content.encode()).hexdigest()[:16]
+    last_content, last_hash = _last_system_prompt_hash
+    if system_content == last_content:
+        return last_hash
+    # Change-detection key, not security: BLAKE2b sized to the 16 hex chars we keep
+    prompt_hash = hashlib.blake2b(system_content.encode(), digest_size=8).hexdigest()
+    _last_system_prompt_hash = (system_content, prompt_hash)
+    return prompt_hash
 
 
 def _prewarm_model_cache(model_id: str, messages: list, logger_ref):
@@ -97,8 +114,6 @@ def _prewarm_model_cache(model_id: str, messages: list, logger_ref):
 
 def trigger_prewarm_if_needed(current_model: str, messages: list, logger_ref):
     """Check if we should pre-warm another model's cache."""
-    from patches import get_tier_config
-
     with _prewarm_lock:
         if _prewarm_state.is_warming:
             return
@@ -224,20 +239,40 @@ def set_prompt_cache_config(config: PromptCacheConfig):
     }
 
 
+def _live_prompt_caches():
+    """(model key, prompt cache) for loaded models whose prompt cache exists.
+
+    One getattr on the wrapper's _prompt_cache slot replaces the hasattr()
+    plus attribute scan each endpoint used to repeat.
+    """
+    from mlx_omni_server.chat.mlx.wrapper_cache import wrapper_cache
+
+    for key, wrapper in list(wrapper_cache._cache.items()):
+        prompt_cache = getattr(wrapper, '_prompt_cache', None)
+        if prompt_cache is not None:
+            yield key, prompt_cache
+
+
+# Seconds a prompt cache stats snapshot is reused (dashboards poll this endpoint)
+PROMPT_CACHE_STATS_TTL = 1.0
+_prompt_cache_stats = {"time": float("-inf"), "stats": {}}
+
+
 @router.get("/prompt-cache/stats")
 def get_prompt_cache_stats():
     """Get SmartPromptCache statistics from loaded models."""
-    from mlx_omni_server.chat.mlx.wrapper_cache import wrapper_cache
-
-    stats = {}
-    try:
-        for key, wrapper in wrapper_cache._cache.items():
-            if hasattr(wrapper, 'prompt_cache') and wrapper._prompt_cache is not None:
-                cache_stats = wrapper.prompt_cache.get_stats()
-                key_str = str(key)
-                stats[key_str] = cache_stats
-    except Exception as e:
-        logger.warning(f"Failed to get prompt cache stats: {e}")
+    now = time.monotonic()
+    if now - _prompt_cache_stats["time"] < PROMPT_CACHE_STATS_TTL:
+        stats = _prompt_cache_stats["stats"]
+    else:
+        stats = {}
+        try:
+            for key, prompt_cache in _live_prompt_caches():
+                stats[str(key)] = prompt_cache.get_stats()
+        except Exception as e:
+            logger.warning(f"Failed to get prompt cache stats: {e}")
+        _prompt_cache_stats["time"] = now
+        _prompt_cache_stats["stats"] = stats
 
     return {
         "caches": stats,
@@ -249,14 +284,11 @@ def get_prompt_cache_stats():
 @router.get("/prompt-cache/health")
 def get_prompt_cache_health():
     """Get human-readable health report for prompt caches."""
-    from mlx_omni_server.chat.mlx.wrapper_cache import wrapper_cache
-
     reports = []
     try:
-        for key, wrapper in wrapper_cache._cache.items():
-            if hasattr(wrapper, 'prompt_cache') and wrapper._prompt_cache is not None:
-                report = wrapper.prompt_cache.get_health_report()
-                reports.append({"model": str(key), "report": report})
+        for key, prompt_cache in _live_prompt_caches():
+            report = prompt_cache.get_health_report()
+            reports.append({"model": str(key), "report": report})
     except Exception as e:
         logger.warning(f"Failed to get prompt cache health: {e}")
 
@@ -266,16 +298,14 @@ def get_prompt_cache_health():
 @router.post("/prompt-cache/clear")
 def clear_prompt_cache():
     """Clear all prompt caches."""
-    from mlx_omni_server.chat.mlx.wrapper_cache import wrapper_cache
-
     cleared = 0
     try:
-        for key, wrapper in wrapper_cache._cache.items():
-            if hasattr(wrapper, 'prompt_cache') and wrapper._prompt_cache is not None:
-                wrapper.prompt_cache.clear()
-                cleared += 1
+        for _, prompt_cache in _live_prompt_caches():
+            prompt_cache.clear()
+            cleared += 1
     except Exception as e:
         logger.warning(f"Failed to clear prompt caches: {e}")
+    _prompt_cache_stats["time"] = float("-inf")
 
     return {"status": "cleared", "caches_cleared": cleared}
 
@@ -300,8 +330,6 @@ def get_prewarm_status():
 @router.post("/prewarm/trigger")
 def trigger_prewarm_manual(request: PrewarmRequest):
     """Manually trigger pre-warm for a specific model."""
-    from patches import resolve_alias_with_backend
-
     resolved_model, backend = resolve_alias_with_backend(request.model_id)
 
     if backend != "mlx":
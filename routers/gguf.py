@@ -44,23 +44,11 @@ def update_gguf_config(update: GGUFConfigUpdate):
 
     config = load_gguf_config()
 
-    if update.enabled is not None:
-        config["enabled"] = update.enabled
-    if update.port is not None:
-        config["port"] = update.port
-    if update.auto_start is not None:
-        config["auto_start"] = update.auto_start
-    if update.llama_server_path is not None:
-        config["llama_server_path"] = update.llama_server_path
-    if update.default_args is not None:
-        config["default_args"] = update.default_args
-    # Speculative decoding settings
-    if update.draft_model is not None:
-        config["draft_model"] = update.draft_model if update.draft_model else None
-    if update.draft_n is not None:
-        config["draft_n"] = update.draft_n
-    if update.draft_p_min is not None:
-        config["draft_p_min"] = update.draft_p_min
+    updates = update.model_dump(exclude_none=True)
+    # An empty draft_model clears speculative decoding
+    if "draft_model" in updates:
+        updates["draft_model"] = updates["draft_model"] or None
+    config.update(updates)
 
     save_gguf_config(config)
     gguf_server.reload_config()
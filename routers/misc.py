@@ -2,21 +2,25 @@
 Miscellaneous API endpoints - logs, proxy, TTS, profiles, inference settings.
 """
 import os
-import json
+import time
+import socket
 import logging
 import asyncio
-import tempfile
 import subprocess
-from queue import Queue, Empty
 from collections import deque
 from typing import Dict, Optional, AsyncGenerator
 from pathlib import Path
 from fastapi import APIRouter, Request
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import httpx
 
-from extensions import InferenceProfiles
+try:
+    import edge_tts as edge_tts_lib
+except ImportError:
+    edge_tts_lib = None
+
+from extensions import InferenceProfiles, fast_json
 from extensions.global_settings import get_global_settings
 
 logger = logging.getLogger("mlx-studio.misc")
@@ -26,8 +30,12 @@ router = APIRouter(tags=["Misc"])
 profiles = InferenceProfiles(default_profile='balanced')
 
 # Log streaming
-_log_buffer: deque = deque(maxlen=100)
-_log_clients: set = set()
+_log_buffer: deque = deque(maxlen=100)  # (entry dict, SSE frame) per log line
+_log_clients: set = set()  # (event loop, asyncio.Queue) per connected SSE client
+_log_client_snapshot: tuple = ()  # Read by WebLogHandler, rebuilt when clients change
+
+# Seconds without a log line before an SSE client gets a keepalive comment
+LOG_KEEPALIVE_INTERVAL = 15.0
 
 
 # =============================================================================
@@ -37,6 +45,10 @@ _log_clients: set = set()
 class WebLogHandler(logging.Handler):
     """Custom log handler that broadcasts logs to SSE clients."""
 
+    # Last formatted timestamp - log bursts share the same second
+    _last_second = -1
+    _last_timestamp = ""
+
     def emit(self, record):
         try:
             log_entry = {
@@ -45,20 +57,39 @@ class WebLogHandler(logging.Handler):
                 "logger": record.name,
                 "message": record.getMessage()
             }
-            _log_buffer.append(log_entry)
+            # Serialized once here rather than once per connected client
+            frame = f"data: {fast_json.dumps(log_entry)}\n\n"
+            _log_buffer.append((log_entry, frame))
 
-            for queue in list(_log_clients):
+            # emit() runs on arbitrary threads; hand the frame to each client's loop
+            for loop, queue in _log_client_snapshot:
                 try:
-                    queue.put_nowait(log_entry)
-                except:
-                    pass
+                    loop.call_soon_threadsafe(_offer_log, queue, frame)
+                except RuntimeError:
+                    pass  # Client's loop already closed
         except Exception:
             pass
 
     def formatTime(self, record):
-        import time
-        ct = time.localtime(record.created)
-        return time.strftime("%H:%M:%S", ct)
+        second = int(record.created)
+        if second != self._last_second:
+            self._last_second = second
+            self._last_timestamp = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._last_timestamp
+
+
+def _refresh_log_client_snapshot():
+    """Rebuild the client tuple WebLogHandler iterates (emit runs on other threads)."""
+    global _log_client_snapshot
+    _log_client_snapshot = tuple(_log_clients)
+
+
+def _offer_log(queue: asyncio.Queue, frame: str):
+    """Queue an SSE frame for a client, dropping it if the client is behind."""
+    try:
+        queue.put_nowait(frame)
+    except asyncio.QueueFull:
+        pass
 
 
 def setup_log_handler():
@@ -96,6 +127,40 @@ class InferenceSettings(BaseModel):
     repetition_context_size: Optional[int] = None
 
 
+# =============================================================================
+# Network
+# =============================================================================
+
+# Seconds the detected LAN IP is reused before probing again
+NETWORK_IP_TTL = 60.0
+_lan_ip_cache = {"ip": None, "checked": float("-inf")}
+
+
+def _probe_lan_ip() -> Optional[str]:
+    """Find the LAN IP via the route to a public address (UDP connect sends nothing)."""
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            s.settimeout(2.0)
+            s.connect(("8.8.8.8", 80))
+            return s.getsockname()[0]
+    except Exception:
+        return None
+
+
+@router.get("/api/network")
+async def get_network():
+    """Return network addresses for frontend."""
+    now = time.monotonic()
+    if now - _lan_ip_cache["checked"] > NETWORK_IP_TTL:
+        _lan_ip_cache["ip"] = await asyncio.to_thread(_probe_lan_ip)
+        _lan_ip_cache["checked"] = now
+    ip = _lan_ip_cache["ip"]
+    if ip:
+        return {"addresses": [{"ip": ip}]}
+    else:
+        return {"addresses": []}
+
+
 # =============================================================================
 # Edge TTS
 # =============================================================================
@@ -123,52 +188,46 @@ EDGE_TTS_VOICES = {
 
 
 @router.get("/api/tts/edge/voices")
-
-@router.get("/api/network")
-
-def get_network():
-    """Return network addresses for frontend."""
-    import socket
-    try:
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        s.connect(("8.8.8.8", 80))
-        ip = s.getsockname()[0]
-        s.close()
-    except Exception:
-        ip = None
-    if ip:
-        return {"addresses": [{"ip": ip}]}
-    else:
-        return {"addresses": []}
-
 def get_edge_tts_voices():
     """Get available Edge TTS voices."""
     return {"voices": EDGE_TTS_VOICES}
 
 
-@router.post("/api/tts/edge")
-async def edge_tts(request: EdgeTTSRequest):
-    """Generate speech using Microsoft Edge TTS."""
-    try:
-        import edge_tts
-
-        with tempfile.NamedTemporaryFile(suffix=".mp3", delete=False) as f:
-            output_path = f.name
+async def _edge_tts_audio(communicate) -> AsyncGenerator[bytes, None]:
+    """Yield the MP3 chunks of an Edge TTS stream, skipping metadata events."""
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            yield chunk["data"]
 
-        communicate = edge_tts.Communicate(request.input, request.voice, rate=request.rate)
-        await communicate.save(output_path)
 
-        return FileResponse(
-            output_path,
-            media_type="audio/mpeg",
-            filename="speech.mp3"
-        )
-    except ImportError:
+@router.post("/api/tts/edge")
+async def edge_tts(request: EdgeTTSRequest):
+    """Generate speech using Microsoft Edge TTS, streaming audio as it is synthesized."""
+    if edge_tts_lib is None:
         return {"error": "edge-tts not installed. Run: pip install edge-tts"}
+
+    try:
+        communicate = edge_tts_lib.Communicate(request.input, request.voice, rate=request.rate)
+        audio = _edge_tts_audio(communicate)
+        # Wait for the first chunk here so synthesis errors still get a JSON error response
+        first_chunk = await audio.__anext__()
+    except StopAsyncIteration:
+        return {"error": "Edge TTS returned no audio"}
     except Exception as e:
         logger.error(f"Edge TTS error: {e}")
         return {"error": str(e)}
 
+    async def body():
+        yield first_chunk
+        async for chunk in audio:
+            yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type="audio/mpeg",
+        headers={"Content-Disposition": 'attachment; filename="speech.mp3"'}
+    )
+
 
 # =============================================================================
 # Profiles & Inference Settings
@@ -212,7 +271,7 @@ def get_inference_settings():
 def update_inference_settings(settings: InferenceSettings):
     """Update inference settings."""
     gs = get_global_settings()
-    update_dict = {k: v for k, v in settings.dict().items() if v is not None}
+    update_dict = settings.model_dump(exclude_none=True)
     gs.update(**update_dict)
     return {"status": "updated", "settings": get_inference_settings()}
 
@@ -221,6 +280,31 @@ def update_inference_settings(settings: InferenceSettings):
 # Web Proxy
 # =============================================================================
 
+# Shared proxy client, created on first use and kept for the life of the
+# process so keep-alive connections (and their TLS sessions) are reused
+_proxy_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_proxy_client() -> httpx.AsyncClient:
+    """Get the shared proxy client, creating it on first use."""
+    global _proxy_client
+    if _proxy_client is None:
+        _proxy_client = httpx.AsyncClient(
+            timeout=30.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30.0),
+        )
+    return _proxy_client
+
+
+async def close_proxy_client():
+    """Close the shared proxy client (called on server shutdown)."""
+    global _proxy_client
+    if _proxy_client is not None and not _proxy_client.is_closed:
+        await _proxy_client.aclose()
+    _proxy_client = None
+
+
 @router.post("/api/proxy")
 async def web_proxy(request: ProxyRequest):
     """Proxy web requests to avoid CORS issues."""
@@ -229,17 +313,16 @@ async def web_proxy(request: ProxyRequest):
         if "User-Agent" not in headers:
             headers["User-Agent"] = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
 
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            response = await client.request(
-                method=request.method,
-                url=request.url,
-                headers=headers
-            )
-            return {
-                "status": response.status_code,
-                "content": response.text,
-                "headers": dict(response.headers)
-            }
+        response = await _get_proxy_client().request(
+            method=request.method,
+            url=request.url,
+            headers=headers
+        )
+        return {
+            "status": response.status_code,
+            "content": response.text,
+            "headers": dict(response.headers)
+        }
     except Exception as e:
         logger.error(f"Proxy error: {e}")
         return {"error": str(e), "status": 500}
@@ -249,24 +332,29 @@ async def web_proxy(request: ProxyRequest):
 # Anthropic Telemetry Capture
 # =============================================================================
 
+# Telemetry event fields worth logging, in display order
+TELEMETRY_DETAIL_KEYS = ("model", "tokens", "duration", "error", "tool", "status", "message")
+
+
 @router.post("/anthropic/api/event_logging/batch")
 async def anthropic_telemetry_capture(request: Request):
     """Capture and log Claude Code CLI telemetry events."""
     try:
         body = await request.json()
+        if not logger.isEnabledFor(logging.INFO):
+            return {"status": "ok"}
         events = body if isinstance(body, list) else body.get("events", [body])
 
         for event in events:
             event_type = event.get("type", event.get("event_type", "unknown"))
             if event_type == "unknown":
-                logger.info(f"[Telemetry] Keys: {list(event.keys())}")
+                logger.info("[Telemetry] Keys: %s", list(event.keys()))
             else:
-                details = {k: v for k, v in event.items()
-                          if k in ["model", "tokens", "duration", "error", "tool", "status", "message"]}
+                details = {k: event[k] for k in TELEMETRY_DETAIL_KEYS if k in event}
                 if details:
-                    logger.info(f"[Telemetry] {event_type}: {details}")
+                    logger.info("[Telemetry] %s: %s", event_type, details)
                 else:
-                    logger.info(f"[Telemetry] {event_type}")
+                    logger.info("[Telemetry] %s", event_type)
     except Exception as e:
         logger.debug(f"[Telemetry] Failed to parse: {e}")
 
@@ -278,25 +366,30 @@ async def anthropic_telemetry_capture(request: Request):
 # =============================================================================
 
 async def log_stream_generator() -> AsyncGenerator[str, None]:
-    """Generate SSE events for log streaming."""
-    queue = Queue(maxsize=100)
-    _log_clients.add(queue)
+    """Generate SSE events for log streaming.
+
+    Waits on an asyncio.Queue fed by WebLogHandler, so new lines are sent as
+    soon as they are logged and idle clients only wake up for keepalives.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+    client = (asyncio.get_running_loop(), queue)
+    _log_clients.add(client)
+    _refresh_log_client_snapshot()
 
     try:
-        for log in list(_log_buffer):
-            yield f"data: {json.dumps(log)}\n\n"
+        for _, frame in list(_log_buffer):
+            yield frame
 
         while True:
             try:
-                log = queue.get_nowait()
-                yield f"data: {json.dumps(log)}\n\n"
-            except Empty:
-                await asyncio.sleep(0.1)
+                yield await asyncio.wait_for(queue.get(), timeout=LOG_KEEPALIVE_INTERVAL)
+            except asyncio.TimeoutError:
                 yield ": keepalive\n\n"
     except asyncio.CancelledError:
         pass
     finally:
-        _log_clients.discard(queue)
+        _log_clients.discard(client)
+        _refresh_log_client_snapshot()
 
 
 @router.get("/api/logs/stream")
@@ -316,7 +409,7 @@ async def stream_logs():
 @router.get("/api/logs/recent")
 def get_recent_logs():
     """Get recent server logs (last 100)."""
-    return {"logs": list(_log_buffer)}
+    return {"logs": [entry for entry, _ in list(_log_buffer)]}
 
 
 # =============================================================================
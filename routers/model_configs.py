@@ -58,8 +58,8 @@ def get_config(model_id: str):
 @router.post("/{model_id:path}")
 def update_config(model_id: str, update: ModelConfigUpdate):
     """Update configuration for a specific model."""
-    # Filter out None values to only update what's provided
-    updates = {k: v for k, v in update.dict().items() if v is not None}
+    # Leave out None values to only update what's provided
+    updates = update.model_dump(exclude_none=True)
 
     if not updates:
         return {"status": "no_changes", "model_id": model_id}
@@ -91,7 +91,7 @@ def get_defaults():
 @router.post("/defaults")
 def update_defaults(update: DefaultsUpdate):
     """Update global default configuration."""
-    updates = {k: v for k, v in update.dict().items() if v is not None}
+    updates = update.model_dump(exclude_none=True)
 
     if not updates:
         return {"status": "no_changes"}
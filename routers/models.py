@@ -2,14 +2,14 @@
 Models API endpoints - model listing, loading, unloading, search.
 """
 import gc
-import json
 import logging
+import functools
 import time
 import threading
 from pathlib import Path
 from fastapi import APIRouter
 
-from extensions import ModelManager
+from extensions import ModelManager, fast_json
 
 logger = logging.getLogger("mlx-studio.models")
 router = APIRouter(prefix="/api/models", tags=["Models"])
@@ -30,8 +30,30 @@ def set_mlx_lock(lock: threading.Lock):
 # Helper Functions
 # =============================================================================
 
+def _file_mtime(path: Path):
+    """st_mtime_ns of a file, or None if it does not exist."""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
 def _get_model_capabilities(model_path: str) -> dict:
-    """Get model capabilities by reading config files."""
+    """Get model capabilities by reading config files.
+
+    Parsed results are cached until tokenizer_config.json or config.json change.
+    """
+    path = Path(model_path)
+    return dict(_read_model_capabilities(
+        model_path,
+        _file_mtime(path / "tokenizer_config.json"),
+        _file_mtime(path / "config.json"),
+    ))
+
+
+@functools.lru_cache(maxsize=256)
+def _read_model_capabilities(model_path: str, tokenizer_mtime, config_mtime) -> dict:
+    """Parse a model's config files; the mtimes only key the cache."""
     path = Path(model_path)
     capabilities = {
         "supports_thinking": False,
@@ -40,22 +62,14 @@ def _get_model_capabilities(model_path: str) -> dict:
         "context_length": None
     }
 
-    if not path.exists():
-        return capabilities
-
     # Check tokenizer_config.json for think tokens
-    tokenizer_config = path / "tokenizer_config.json"
-    if tokenizer_config.exists():
+    if tokenizer_mtime is not None:
         try:
-            with open(tokenizer_config) as f:
-                config = json.load(f)
+            config = fast_json.loads((path / "tokenizer_config.json").read_bytes())
 
             added_tokens = config.get("added_tokens_decoder", {})
-            for token_info in added_tokens.values():
-                content = token_info.get("content", "")
-                if content == "<think>":
-                    capabilities["supports_thinking"] = True
-                    break
+            if any(token_info.get("content") == "<think>" for token_info in added_tokens.values()):
+                capabilities["supports_thinking"] = True
 
             chat_template = config.get("chat_template", "")
             if "enable_thinking" in chat_template:
@@ -64,11 +78,9 @@ def _get_model_capabilities(model_path: str) -> dict:
             pass
 
     # Check config.json for model family and context length
-    model_config = path / "config.json"
-    if model_config.exists():
+    if config_mtime is not None:
         try:
-            with open(model_config) as f:
-                config = json.load(f)
+            config = fast_json.loads((path / "config.json").read_bytes())
 
             architectures = config.get("architectures", [])
             model_type = config.get("model_type", "")
@@ -307,9 +319,9 @@ def unload_model(model_id: str = None):
 
 
 @router.get("/search")
-def search_models(q: str = "", limit: int = 20, backend: str = "all"):
+async def search_models(q: str = "", limit: int = 20, backend: str = "all"):
     """Search for MLX and GGUF models on HuggingFace."""
-    results = model_manager.search_hf_models(q, limit, backend)
+    results = await model_manager.search_hf_models_async(q, limit, backend)
     return {"results": results, "query": q, "backend": backend}
 
 
@@ -9,6 +9,8 @@ from typing import Dict, Optional
 from fastapi import APIRouter
 from pydantic import BaseModel
 
+from extensions import fast_json
+
 logger = logging.getLogger("mlx-studio.routing")
 router = APIRouter(prefix="/api", tags=["Routing"])
 
@@ -25,8 +27,7 @@ def load_routing_config() -> dict:
     """Load Claude routing configuration."""
     if ROUTING_FILE.exists():
         try:
-            with open(ROUTING_FILE) as f:
-                return json.load(f)
+            return fast_json.loads(ROUTING_FILE.read_bytes())
         except Exception as e:
             logger.warning(f"Failed to load routing config: {e}")
     return {
@@ -260,7 +261,7 @@ def add_remote(config: RemoteConfig):
         remotes.append({"name": config.name, "url": config.url, "enabled": config.enabled})
 
     save_remotes(remotes)
-    return {"status": "added", "remote": config.dict()}
+    return {"status": "added", "remote": config.model_dump()}
 
 
 @router.post("/remotes/{name}")
@@ -342,8 +343,7 @@ def load_aliases() -> dict:
     """Load model aliases from config file."""
     if ALIASES_FILE.exists():
         try:
-            with open(ALIASES_FILE) as f:
-                return json.load(f)
+            return fast_json.loads(ALIASES_FILE.read_bytes())
         except Exception as e:
             logger.warning(f"Failed to load aliases: {e}")
     return {}
@@ -23,8 +23,10 @@ Environment Variables (Cache Configuration):
 import os
 import sys
 import argparse
+import importlib.util
 import logging
 import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 # =============================================================================
@@ -70,6 +72,13 @@ if _args.model_cache_size is not None:
 if _args.kv_bits is not None:
     os.environ["MLX_KV_BITS"] = str(_args.kv_bits)
 
+# Accelerated HuggingFace downloads. huggingface_hub reads these once at import,
+# and apply_patches() imports it (via mlx_lm), so they must be set before that.
+# hf_transfer has to be installed or huggingface_hub refuses to download.
+if importlib.util.find_spec("hf_transfer") is not None:
+    os.environ.setdefault("HF_HUB_ENABLE_HF_TRANSFER", "1")
+os.environ.setdefault("HF_XET_HIGH_PERFORMANCE", "1")
+
 # Add vendor mlx-omni-server to path
 VENDOR_PATH = Path(__file__).parent / "vendor" / "mlx-omni-server" / "src"
 sys.path.insert(0, str(VENDOR_PATH))
@@ -107,7 +116,7 @@ from routers.routing import router as routing_router
 from routers.gguf import router as gguf_router
 from routers.models import router as models_router, set_mlx_lock as set_models_lock
 from routers.cache import router as cache_router, set_mlx_lock as set_cache_lock
-from routers.misc import router as misc_router, setup_log_handler
+from routers.misc import router as misc_router, setup_log_handler, close_proxy_client
 from routers.model_configs import router as model_configs_router
 
 logging.basicConfig(
@@ -127,10 +136,18 @@ set_cache_lock(_mlx_lock)
 # Create FastAPI App
 # =============================================================================
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shared HTTP clients outlive requests; close them on shutdown
+    await close_proxy_client()
+
+
 app = FastAPI(
     title="MLX Studio",
     version="2.0.0",
-    description="High-performance MLX inference with KV caching"
+    description="High-performance MLX inference with KV caching",
+    lifespan=lifespan,
 )
 
 app.add_middleware(